@@ -1,5 +1,12 @@
 import os
 from django.core.asgi import get_asgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "building_mgmt.settings")  # <-- same name
-application = get_asgi_application()
\ No newline at end of file
+application = get_asgi_application()
+
+from core.context_processors import warm_nav_urls  # noqa: E402  (needs apps loaded)
+
+# Same startup warm-up as wsgi.py.
+get_resolver().reverse_dict
+warm_nav_urls()
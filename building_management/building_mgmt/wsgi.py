@@ -1,5 +1,12 @@
 import os
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "building_mgmt.settings")  # <-- same name
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+from core.context_processors import warm_nav_urls  # noqa: E402  (needs apps loaded)
+
+# Build the URL resolver at import so gunicorn's preload_app shares it across workers.
+get_resolver().reverse_dict
+warm_nav_urls()
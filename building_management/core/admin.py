@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.utils import timezone
 
 from .models import (
     BudgetFeatureFlag,
@@ -21,6 +23,23 @@ from .models import (
 )
 
 
+class ChangelistOnlyMixin:
+    """
+    Restrict changelist queries to the columns ``list_display`` renders. Change
+    forms keep loading full rows so editing never triggers deferred-field queries.
+    """
+
+    changelist_only_fields: tuple[str, ...] = ()
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        match = getattr(request, "resolver_match", None)
+        url_name = getattr(match, "url_name", None) or ""
+        if self.changelist_only_fields and url_name.endswith("_changelist"):
+            qs = qs.only(*self.changelist_only_fields)
+        return qs
+
+
 class WorkOrderAttachmentInline(admin.TabularInline):
     model = WorkOrderAttachment
     extra = 0
@@ -45,10 +64,11 @@ class BuildingMembershipInline(admin.TabularInline):
     show_change_link = True
 
 @admin.register(Building)
-class BuildingAdmin(admin.ModelAdmin):
+class BuildingAdmin(ChangelistOnlyMixin, admin.ModelAdmin):
     list_display = ("name", "address", "owner")
     search_fields = ("name", "address", "owner__username")
     list_select_related = ("owner",)
+    changelist_only_fields = ("id", "name", "address", "owner__username")
     autocomplete_fields = ("owner",)
     inlines = (BuildingMembershipInline,)
 
@@ -61,7 +81,7 @@ class UnitAdmin(admin.ModelAdmin):
     autocomplete_fields = ("building",)
 
 @admin.register(WorkOrder)
-class WorkOrderAdmin(admin.ModelAdmin):
+class WorkOrderAdmin(ChangelistOnlyMixin, admin.ModelAdmin):
     list_display = (
         "title",
         "building",
@@ -74,7 +94,18 @@ class WorkOrderAdmin(admin.ModelAdmin):
     )
     list_filter = ("building", "forwarded_to_building", "priority", "status", "archived_at")
     search_fields = ("title", "description", "unit__number", "building__name", "forwarded_to_building__name")
-    list_select_related = ("building", "unit", "forwarded_to_building", "forwarded_by")
+    list_select_related = ("building", "forwarded_to_building", "forwarded_by")
+    changelist_only_fields = (
+        "id",
+        "title",
+        "building__name",
+        "forwarded_to_building__name",
+        "forwarded_by__username",
+        "priority",
+        "status",
+        "deadline",
+        "archived_at",
+    )
     autocomplete_fields = ("building", "unit", "forwarded_to_building", "forwarded_by")
     inlines = (WorkOrderAttachmentInline, WorkOrderForwardingInline)
 
@@ -112,7 +143,7 @@ class TodoActivityAdmin(admin.ModelAdmin):
 
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(ChangelistOnlyMixin, admin.ModelAdmin):
     list_display = (
         "title",
         "category",
@@ -126,15 +157,33 @@ class NotificationAdmin(admin.ModelAdmin):
     list_filter = ("category", "level", "acknowledged_at", "snoozed_until")
     search_fields = ("title", "body", "key", "user__username")
     list_select_related = ("user",)
+    changelist_only_fields = (
+        "id",
+        "title",
+        "category",
+        "level",
+        "user__username",
+        "snoozed_until",
+        "acknowledged_at",
+        "created_at",
+    )
     date_hierarchy = "created_at"
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related("user")
-
-    @admin.display(boolean=True, description="Active")
+        # Mirrors Notification.is_active() in SQL; keep the two in sync.
+        today = timezone.localdate()
+        return qs.select_related("user").annotate(
+            is_active_db=ExpressionWrapper(
+                Q(acknowledged_at__isnull=True)
+                & (Q(snoozed_until__isnull=True) | Q(snoozed_until__lte=today)),
+                output_field=BooleanField(),
+            )
+        )
+
+    @admin.display(boolean=True, description="Active", ordering="is_active_db")
     def is_active_display(self, obj):
-        return obj.is_active()
+        return obj.is_active_db
 
 
 @admin.register(BuildingMembership)
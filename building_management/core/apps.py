@@ -1,4 +1,25 @@
+from importlib.util import find_spec
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+def _validate_s3_storage() -> None:
+    """
+    Check the S3 storage configuration without importing storages/boto3.
+
+    The backend itself is only imported on first file access, so
+    processes that never touch uploads skip the import cost.
+    """
+    if find_spec("storages") is None:  # pragma: no cover - configuration error path
+        raise ImproperlyConfigured(
+            "DJANGO_FILE_STORAGE='s3' requires django-storages[boto3] to be installed."
+        )
+    if not getattr(settings, "AWS_STORAGE_BUCKET_NAME", None):
+        raise ImproperlyConfigured(
+            "AWS_STORAGE_BUCKET_NAME must be set when DJANGO_FILE_STORAGE='s3'."
+        )
 
 
 class CoreConfig(AppConfig):
@@ -7,3 +28,6 @@ class CoreConfig(AppConfig):
 
     def ready(self) -> None:
         from . import signals  # noqa: F401
+
+        if getattr(settings, "DEFAULT_FILE_STORAGE", "").endswith("S3Boto3Storage"):
+            _validate_s3_storage()
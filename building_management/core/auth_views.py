@@ -1,5 +1,7 @@
 from django.contrib.auth import logout, get_user_model
 from django.contrib.auth.views import LoginView
+from django.db import transaction
+from django.db.models import F
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils import timezone
@@ -20,9 +22,10 @@ class RoleAwareLoginView(LoginView):
 
     def form_valid(self, form):
         user = form.get_user()
-        profile, created = UserSecurityProfile.objects.get_or_create(user=user)
-        if profile.failed_login_attempts or profile.lock_reason:
-            profile.reset()
+        # The profile row is created with the user (core.signals).
+        UserSecurityProfile.objects.filter(user=user).exclude(
+            failed_login_attempts=0, lock_reason=""
+        ).update(failed_login_attempts=0, locked_at=None, lock_reason="")
         return super().form_valid(form)
 
     def form_invalid(self, form):
@@ -40,9 +43,8 @@ class RoleAwareLoginView(LoginView):
         except UserModel.DoesNotExist:
             return
 
-        profile, created = UserSecurityProfile.objects.get_or_create(user=user)
-
         if not user.is_active:
+            profile, created = UserSecurityProfile.objects.get_or_create(user=user)
             if profile.lock_reason == UserSecurityProfile.LockReason.FAILED_ATTEMPTS:
                 form.add_error(
                     None,
@@ -55,19 +57,21 @@ class RoleAwareLoginView(LoginView):
                 profile.save(update_fields=["lock_reason"])
             return
 
-        profile.failed_login_attempts += 1
-        updates = ["failed_login_attempts"]
-        locked_now = False
-
-        if profile.failed_login_attempts >= self.lock_threshold:
-            user.is_active = False
-            user.save(update_fields=["is_active"])
-            profile.locked_at = timezone.now()
-            profile.lock_reason = UserSecurityProfile.LockReason.FAILED_ATTEMPTS
-            updates.extend(["locked_at", "lock_reason"])
-            locked_now = True
-
-        profile.save(update_fields=updates)
+        profiles = UserSecurityProfile.objects.filter(user=user)
+        with transaction.atomic():
+            # Increment in SQL so concurrent failures never lose a count.
+            if not profiles.update(failed_login_attempts=F("failed_login_attempts") + 1):
+                UserSecurityProfile.objects.get_or_create(
+                    user=user, defaults={"failed_login_attempts": 1}
+                )
+            locked_now = bool(
+                profiles.filter(failed_login_attempts__gte=self.lock_threshold).update(
+                    locked_at=timezone.now(),
+                    lock_reason=UserSecurityProfile.LockReason.FAILED_ATTEMPTS,
+                )
+            )
+            if locked_now:
+                UserModel.objects.filter(pk=user.pk).update(is_active=False)
 
         if locked_now:
             form.add_error(
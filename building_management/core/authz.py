@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable, Optional, Set
+from typing import Optional, Set
 
 from django.utils.functional import cached_property
 
@@ -12,6 +12,7 @@ from .models import (
     MembershipRole,
     RoleAuditLog,
     WorkOrderAuditLog,
+    resolve_role_capabilities,
 )
 
 logger = logging.getLogger(__name__)
@@ -24,20 +25,30 @@ class CapabilityResolver:
         self.user = user
 
     @cached_property
-    def _memberships(self) -> Iterable[BuildingMembership]:
+    def _memberships(self) -> tuple[tuple[Optional[int], str, Optional[dict]], ...]:
         if not self.user or not getattr(self.user, "is_authenticated", False):
-            return []
-        return list(
-            BuildingMembership.objects.filter(user=self.user).select_related("building")
+            return ()
+        return tuple(
+            BuildingMembership.objects.filter(user=self.user).values_list(
+                "building_id", "role", "capabilities_override"
+            )
         )
 
+    @property
+    def membership_rows(self) -> tuple[tuple[Optional[int], str], ...]:
+        """(building_id, role) pairs for every membership of the user."""
+        return tuple((building_id, role) for building_id, role, _ in self._memberships)
+
     @cached_property
-    def _global_capabilities(self) -> Set[str]:
-        caps: Set[str] = set()
-        for membership in self._memberships:
-            if membership.building_id is None:
-                caps |= membership.resolved_capabilities
-        return caps
+    def _capabilities_by_building(self) -> dict[Optional[int], frozenset[str]]:
+        grouped: dict[Optional[int], Set[str]] = {}
+        for building_id, role, overrides in self._memberships:
+            grouped.setdefault(building_id, set()).update(resolve_role_capabilities(role, overrides))
+        return {building_id: frozenset(caps) for building_id, caps in grouped.items()}
+
+    @cached_property
+    def _global_capabilities(self) -> frozenset[str]:
+        return self._capabilities_by_building.get(None, frozenset())
 
     @cached_property
     def _office_building_id(self) -> int | None:
@@ -54,8 +65,8 @@ class CapabilityResolver:
             MembershipRole.BACKOFFICE,
             MembershipRole.ADMINISTRATOR,
         }
-        for membership in self._memberships:
-            if membership.role in allowed:
+        for _, role, _ in self._memberships:
+            if role in allowed:
                 return True
         return False
 
@@ -78,23 +89,48 @@ class CapabilityResolver:
     def visible_building_ids(self) -> Optional[Set[int]]:
         if Capability.VIEW_ALL_BUILDINGS in self._global_capabilities:
             return None
-        building_ids = {m.building_id for m in self._memberships if m.building_id}
+        building_ids = {building_id for building_id, _, _ in self._memberships if building_id}
         if self._office_building_id and self._has_office_visibility_role:
             building_ids.add(self._office_building_id)
         return building_ids
 
     def capabilities_for(self, building_id: Optional[int] = None) -> Set[str]:
         caps = set(self._global_capabilities)
-        if building_id is None:
-            return caps
-        for membership in self._memberships:
-            if membership.building_id == building_id:
-                caps |= membership.resolved_capabilities
+        if building_id is not None:
+            caps |= self._capabilities_by_building.get(building_id, frozenset())
         return caps
 
     def has(self, capability: str, *, building_id: Optional[int] = None) -> bool:
-        caps = self.capabilities_for(building_id)
-        return capability in caps
+        if capability in self._global_capabilities:
+            return True
+        if building_id is None:
+            return False
+        return capability in self._capabilities_by_building.get(building_id, frozenset())
+
+    def has_any(self, *capabilities: str, building_id: Optional[int] = None) -> bool:
+        if not self._global_capabilities.isdisjoint(capabilities):
+            return True
+        if building_id is None:
+            return False
+        return not self._capabilities_by_building.get(building_id, frozenset()).isdisjoint(capabilities)
+
+
+def resolver_for(user) -> CapabilityResolver:
+    """Return the resolver memoized on ``user`` so one request shares a single instance."""
+    if user is None:
+        return CapabilityResolver(user)
+    resolver = getattr(user, "_capability_resolver_cache", None)
+    if resolver is None:
+        resolver = CapabilityResolver(user)
+        setattr(user, "_capability_resolver_cache", resolver)
+    return resolver
+
+
+def log_role_actions(entries: list[dict]) -> list[RoleAuditLog]:
+    objs = [RoleAuditLog(**{**entry, "payload": entry.get("payload") or {}}) for entry in entries]
+    if not objs:
+        return []
+    return RoleAuditLog.objects.bulk_create(objs, batch_size=500)
 
 
 def log_role_action(*, actor, target_user, building, role: str, action: str, payload=None):
@@ -1,16 +1,61 @@
 from __future__ import annotations
 
-from django.urls import NoReverseMatch, reverse
+import functools
+from types import MappingProxyType
+
+from django.conf import settings
+from django.urls import NoReverseMatch, get_script_prefix, get_urlconf, reverse
 from django.utils import timezone
 
-from .authz import Capability, CapabilityResolver
+from .authz import Capability, resolver_for
 from .models import Building, BudgetFeatureFlag, MembershipRole, TodoItem, start_of_week
-from .utils.roles import user_has_role, user_is_lawyer
+from .utils.roles import user_roles
 
+_ADMIN_MENU_CAPABILITIES = frozenset(
+    (Capability.VIEW_ALL_BUILDINGS, Capability.MASS_ASSIGN, Capability.VIEW_AUDIT_LOG)
+)
+_BUDGET_CAPABILITIES = frozenset((Capability.VIEW_BUDGETS, Capability.APPROVE_BUDGETS))
+_LAWYER_MENU_ROLES = frozenset((MembershipRole.LAWYER, MembershipRole.ADMINISTRATOR))
+_OFFICE_MENU_ROLES = frozenset((MembershipRole.ADMINISTRATOR, MembershipRole.BACKOFFICE))
 
-def theme(request):
-    data = {
-        "theme": request.session.get("theme", "light"),
+
+@functools.lru_cache(maxsize=128)
+def _cached_reverse(name: str, args: tuple, urlconf: str, script_prefix: str) -> tuple[str, bool]:
+    try:
+        return reverse(name, urlconf=urlconf, args=args), True
+    except NoReverseMatch:
+        return "", False
+
+
+def _safe_reverse(name: str, args: tuple = ()) -> tuple[str, bool]:
+    """Return (url, found) for a URL name, memoized per URLconf and script prefix."""
+    # Nav URLs are constant for a given URLconf and script prefix.
+    return _cached_reverse(name, args, get_urlconf() or settings.ROOT_URLCONF, get_script_prefix())
+
+
+_NAV_URL_NAMES = (
+    "core:work_orders_list",
+    "core:work_orders_archive",
+    "core:work_orders_mass_assign",
+    "core:lawyer_work_orders",
+    "core:users_list",
+    "core:budget_list",
+    "core:budget_archived_list",
+    "core:budget_review_queue",
+    "core:audit_trail",
+    "core:todo_list",
+)
+
+
+def warm_nav_urls() -> None:
+    """Populate the _safe_reverse() cache for the static navigation URLs."""
+    for name in _NAV_URL_NAMES:
+        _safe_reverse(name)
+
+
+_THEME_DEFAULTS = MappingProxyType(
+    {
+        "theme": "light",
         "work_orders_enabled": False,
         "work_orders_url": "",
         "work_orders_archive_enabled": False,
@@ -36,103 +81,70 @@ def theme(request):
         "budget_review_enabled": False,
         "budget_review_url": "",
     }
+)
+
+
+def theme(request):
+    data = _THEME_DEFAULTS.copy()
+    # requests without session middleware (health checks) keep the default theme
+    session = getattr(request, "session", None)
+    if session is not None:
+        data["theme"] = session.get("theme", "light")
 
     user = getattr(request, "user", None)
-    if user and user.is_authenticated:
-        resolver = CapabilityResolver(user)
-        try:
-            data["work_orders_url"] = reverse("core:work_orders_list")
-            data["work_orders_enabled"] = True
-        except NoReverseMatch:
-            pass
-
-        if resolver.has(Capability.VIEW_ALL_BUILDINGS):
-            try:
-                data["work_orders_archive_url"] = reverse("core:work_orders_archive")
-                data["work_orders_archive_enabled"] = True
-            except NoReverseMatch:
-                pass
-        if resolver.has(Capability.MASS_ASSIGN):
-            try:
-                data["mass_assign_work_orders_url"] = reverse("core:work_orders_mass_assign")
-                data["mass_assign_work_orders_enabled"] = True
-            except NoReverseMatch:
-                pass
-        if user_is_lawyer(user) or user_has_role(user, MembershipRole.ADMINISTRATOR) or getattr(user, "is_superuser", False):
-            try:
-                data["lawyer_orders_url"] = reverse("core:lawyer_work_orders")
-                data["lawyer_orders_enabled"] = True
-            except NoReverseMatch:
-                pass
-        if resolver.has(Capability.VIEW_USERS):
-            try:
-                data["user_management_url"] = reverse("core:users_list")
-                data["can_view_user_management"] = True
-            except NoReverseMatch:
-                pass
-        elif getattr(user, "is_superuser", False):
-            try:
-                data["user_management_url"] = reverse("core:users_list")
-                data["can_view_user_management"] = True
-            except NoReverseMatch:
-                pass
-        if resolver.has(Capability.VIEW_BUDGETS) and BudgetFeatureFlag.is_enabled_for(user):
-            try:
-                data["budgets_url"] = reverse("core:budget_list")
-                data["budgets_enabled"] = True
-            except NoReverseMatch:
-                pass
-            if resolver.has(Capability.APPROVE_BUDGETS):
-                try:
-                    data["budgets_archived_url"] = reverse("core:budget_archived_list")
-                    data["budgets_archived_enabled"] = True
-                except NoReverseMatch:
-                    pass
-        if resolver.has(Capability.APPROVE_BUDGETS) and BudgetFeatureFlag.is_enabled_for(user):
-            try:
-                data["budget_review_url"] = reverse("core:budget_review_queue")
-                data["budget_review_enabled"] = True
-            except NoReverseMatch:
-                pass
-        if resolver.has(Capability.VIEW_AUDIT_LOG):
-            try:
-                data["role_audit_url"] = reverse("core:audit_trail")
-                data["role_audit_enabled"] = True
-            except NoReverseMatch:
-                pass
-        try:
-            data["todos_url"] = reverse("core:todo_list")
-            data["todos_enabled"] = True
-        except NoReverseMatch:
-            pass
-        try:
-            week_start = start_of_week()
-            badge_count = (
-                TodoItem.objects.filter(
-                    user=user,
-                    status__in=[TodoItem.Status.PENDING, TodoItem.Status.IN_PROGRESS],
-                    week_start=week_start,
-                )
-                .only("id")
-                .count()
+    if not (user and user.is_authenticated):
+        return data
+
+    caps = resolver_for(user).capabilities_for()
+    roles = user_roles(user)
+    is_superuser = bool(getattr(user, "is_superuser", False))
+    data["work_orders_url"], data["work_orders_enabled"] = _safe_reverse("core:work_orders_list")
+
+    if not caps.isdisjoint(_ADMIN_MENU_CAPABILITIES):
+        if Capability.VIEW_ALL_BUILDINGS in caps:
+            data["work_orders_archive_url"], data["work_orders_archive_enabled"] = _safe_reverse("core:work_orders_archive")
+        if Capability.MASS_ASSIGN in caps:
+            data["mass_assign_work_orders_url"], data["mass_assign_work_orders_enabled"] = _safe_reverse("core:work_orders_mass_assign")
+        if Capability.VIEW_AUDIT_LOG in caps:
+            data["role_audit_url"], data["role_audit_enabled"] = _safe_reverse("core:audit_trail")
+    if is_superuser or not roles.isdisjoint(_LAWYER_MENU_ROLES):
+        data["lawyer_orders_url"], data["lawyer_orders_enabled"] = _safe_reverse("core:lawyer_work_orders")
+    if is_superuser or Capability.VIEW_USERS in caps:
+        data["user_management_url"], data["can_view_user_management"] = _safe_reverse("core:users_list")
+    if not caps.isdisjoint(_BUDGET_CAPABILITIES) and BudgetFeatureFlag.is_enabled_for(user):
+        can_approve_budgets = Capability.APPROVE_BUDGETS in caps
+        if Capability.VIEW_BUDGETS in caps:
+            data["budgets_url"], data["budgets_enabled"] = _safe_reverse("core:budget_list")
+            if can_approve_budgets:
+                data["budgets_archived_url"], data["budgets_archived_enabled"] = _safe_reverse("core:budget_archived_list")
+        if can_approve_budgets:
+            data["budget_review_url"], data["budget_review_enabled"] = _safe_reverse("core:budget_review_queue")
+    data["todos_url"], data["todos_enabled"] = _safe_reverse("core:todo_list")
+    try:
+        week_start = start_of_week()
+        badge_count = (
+            TodoItem.objects.filter(
+                user=user,
+                status__in=[TodoItem.Status.PENDING, TodoItem.Status.IN_PROGRESS],
+                week_start=week_start,
             )
-            data["todos_badge_count"] = badge_count
-        except Exception:
-            data["todos_badge_count"] = 0
+            .only("id")
+            .count()
+        )
+        data["todos_badge_count"] = badge_count
+    except Exception:
+        data["todos_badge_count"] = 0
 
-        is_admin_role = user_has_role(user, MembershipRole.ADMINISTRATOR)
-        is_backoffice_role = user_has_role(user, MembershipRole.BACKOFFICE)
-        if is_admin_role or is_backoffice_role or getattr(user, "is_superuser", False):
+    if is_superuser or not roles.isdisjoint(_OFFICE_MENU_ROLES):
+        office_id = None
+        try:
+            office_id = Building.system_default_id()
+        except Exception:
             office_id = None
-            try:
-                office_id = Building.system_default_id()
-            except Exception:
-                office_id = None
-            if office_id:
-                try:
-                    data["office_building_url"] = reverse("core:building_detail", args=[office_id])
-                    data["office_building_pattern"] = f"/buildings/{office_id}/"
-                    data["office_building_enabled"] = True
-                except NoReverseMatch:
-                    pass
+        if office_id:
+            office_url, found = _safe_reverse("core:building_detail", (office_id,))
+            if found:
+                data["office_building_url"] = office_url
+                data["office_building_pattern"] = f"/buildings/{office_id}/"
+                data["office_building_enabled"] = True
     return data
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import functools
 from datetime import timedelta
 from decimal import Decimal
 from pathlib import Path
+from types import MappingProxyType
 
 from django import forms
 from django.contrib.auth import get_user_model
@@ -16,7 +18,7 @@ from django.db import transaction
 from django.db.models import F, Q
 from django.db.models.functions import Lower
 
-from .authz import Capability, CapabilityResolver
+from .authz import Capability, resolver_for
 from .models import (
     BudgetFeatureFlag,
     BudgetRequest,
@@ -32,7 +34,14 @@ from .models import (
     WorkOrderAttachment,
     UserSecurityProfile,
 )
-from .utils.roles import user_can_approve_work_orders, user_is_admin_or_backoffice, user_is_lawyer
+from .utils.roles import (
+    technician_owner_choices,
+    technician_owner_queryset,
+    user_can_approve_work_orders,
+    user_is_admin_or_backoffice,
+    user_is_lawyer,
+    user_roles,
+)
 
 ROLE_DESCRIPTIONS = {
     MembershipRole.TECHNICIAN: _("Technician – access to assigned buildings."),
@@ -47,7 +56,7 @@ class RoleSelectionMixin:
 
     def role_description(self, value):
         return ROLE_DESCRIPTIONS.get(value, "")
-from .services.files import validate_work_order_attachment
+from .services.files import attachment_validation_config, validate_work_order_attachment
 
 User = get_user_model()
 
@@ -61,12 +70,17 @@ class MultipleFileField(forms.FileField):
     Accept multiple uploaded files. Returns a list of UploadedFile objects.
     """
 
-    widget = MultipleFileInput(attrs={"multiple": True})
+    widget = MultipleFileInput
+    default_widget_attrs = MappingProxyType({"multiple": True, "class": "input"})
 
     def __init__(self, *args, **kwargs):
-        widget = kwargs.pop("widget", self.widget)
-        widget.attrs.setdefault("multiple", True)
-        widget.attrs.setdefault("class", "input")
+        widget = kwargs.pop("widget", None)
+        if widget is None or isinstance(widget, type):
+            # Build a fresh widget per field; never mutate a shared class-level instance.
+            widget = (widget or self.widget)(attrs=dict(self.default_widget_attrs))
+        else:
+            for key, value in self.default_widget_attrs.items():
+                widget.attrs.setdefault(key, value)
         super().__init__(*args, widget=widget, **kwargs)
 
     def clean(self, data, initial=None):
@@ -77,10 +91,11 @@ class MultipleFileField(forms.FileField):
 
         cleaned = []
         errors = []
+        config = attachment_validation_config()
         for uploaded in data:
             try:
                 cleaned_file = super().clean(uploaded, initial)
-                validate_work_order_attachment(cleaned_file)
+                validate_work_order_attachment(cleaned_file, config=config)
                 cleaned.append(cleaned_file)
             except forms.ValidationError as exc:
                 errors.extend(exc.error_list)
@@ -89,29 +104,35 @@ class MultipleFileField(forms.FileField):
         return cleaned
 
 
+_USER_CHECKBOX_CLASSES = "user-checkbox h-4 w-4 rounded border border-slate-300 text-emerald-600 focus:ring-emerald-500"
+
+
+def _merge_classes(existing: str, extra: str) -> str:
+    """Append ``extra`` CSS classes to ``existing``."""
+    return f"{existing} {extra}".strip()
+
+
 class RoleAwareCheckboxSelect(forms.CheckboxSelectMultiple):
     """Checkbox widget that carries the role metadata for each option."""
 
     def __init__(self, *args, role_map=None, role_labels=None, **kwargs):
         self.role_map = {str(key): value for key, value in (role_map or {}).items()}
         self.role_labels = {str(key): value for key, value in (role_labels or {}).items()}
+        self._role_attrs = {
+            key: ",".join(codes) if isinstance(codes, (list, tuple, set)) else str(codes)
+            for key, codes in self.role_map.items()
+            if codes
+        }
         kwargs.setdefault("attrs", {})
         super().__init__(*args, **kwargs)
 
     def create_option(self, name, value, label, selected, index, subindex=None, attrs=None):
         option = super().create_option(name, value, label, selected, index, subindex=subindex, attrs=attrs)
-        role_codes = self.role_map.get(str(option["value"]))
-        role_labels = self.role_labels.get(str(option["value"]))
         option_attrs = option.setdefault("attrs", {})
-        base_classes = option_attrs.get("class", "")
-        option_attrs["class"] = (
-            f"{base_classes} user-checkbox h-4 w-4 rounded border border-slate-300 text-emerald-600 focus:ring-emerald-500"
-        ).strip()
-        if role_codes:
-            if isinstance(role_codes, (list, tuple, set)):
-                option_attrs["data-role"] = ",".join(role_codes)
-            else:
-                option_attrs["data-role"] = str(role_codes)
+        option_attrs["class"] = _merge_classes(option_attrs.get("class", ""), _USER_CHECKBOX_CLASSES)
+        role_attr = self._role_attrs.get(str(option["value"]))
+        if role_attr:
+            option_attrs["data-role"] = role_attr
         return option
 
 
@@ -132,11 +153,18 @@ class BuildingForm(forms.ModelForm):
         widgets = {
             "description": forms.Textarea(attrs={"rows": 6}),
         }
+        labels = {
+            "name": _("Name"),
+            "owner": _("Owner"),
+            "role": _("Role"),
+            "address": _("Address"),
+            "description": _("Description"),
+        }
 
     def __init__(self, *args, user=None, **kwargs):
         super().__init__(*args, **kwargs)
         self._user = user
-        self._resolver = CapabilityResolver(user) if user and user.is_authenticated else None
+        self._resolver = resolver_for(user) if user and user.is_authenticated else None
         user_admin_check = getattr(self, "_user_is_admin", None)
         self._is_admin = user_admin_check(user) if callable(user_admin_check) else False
         self._can_manage_buildings = (
@@ -145,54 +173,35 @@ class BuildingForm(forms.ModelForm):
             else False
         )
         self._can_assign_owner = self._user_can_assign_owner(user)
-        self.fields["name"].label = _("Name")
-        self.fields["address"].label = _("Address")
-        self.fields["description"].label = _("Description")
-        self.fields["role"].label = _("Role")
-        if "owner" in self.fields:
-            self.fields["owner"].label = _("Owner")
 
         # Keep a predictable field order for the building form layout.
         ordered_fields = ["owner", "role", "name", "address", "description"]
         self.order_fields([name for name in ordered_fields if name in self.fields])
 
         if self._can_assign_owner:
-            owner_queryset = (
-                User.objects.filter(
-                    memberships__building__isnull=True,
-                    memberships__role=MembershipRole.TECHNICIAN,
-                )
-                .order_by("username")
-                .distinct()
-            )
-            self.fields["owner"].queryset = owner_queryset
-            owner_ids = list(owner_queryset.values_list("pk", flat=True))
-            technician_ids = set(
-                BuildingMembership.objects.filter(
-                    user_id__in=owner_ids,
-                    building__isnull=True,
-                    role=MembershipRole.TECHNICIAN,
-                ).values_list("user_id", flat=True)
-            )
+            owner_field = self.fields["owner"]
+            # The queryset stays on the field so the posted owner is still validated.
+            owner_field.queryset = technician_owner_queryset()
+            owner_choices = technician_owner_choices()
+            owner_field.choices = owner_choices
+            technician_ids = {pk for pk, _label in owner_choices}
             self._owner_technician_ids = technician_ids
-            self.fields["owner"].widget.attrs["data-technician-users"] = ",".join(
+            owner_field.widget.attrs["data-technician-users"] = ",".join(
                 str(pk) for pk in sorted(technician_ids)
             )
-            self.fields["owner"].empty_label = None
-            self.fields["owner"].label_from_instance = lambda obj: obj.get_full_name() or obj.get_username()
-            self.fields["owner"].label = _("Owner")
+            owner_field.empty_label = None
         else:
             self.fields.pop("owner", None)
 
-        owner_user = self._determine_owner_candidate()
+        owner_id = self._determine_owner_candidate_id()
         owner_is_technician = False
-        if owner_user and getattr(owner_user, "pk", None):
+        if owner_id:
             tech_ids = getattr(self, "_owner_technician_ids", None)
             if tech_ids is not None:
-                owner_is_technician = owner_user.pk in tech_ids
+                owner_is_technician = owner_id in tech_ids
             else:
                 owner_is_technician = BuildingMembership.objects.filter(
-                    user=owner_user,
+                    user_id=owner_id,
                     building__isnull=True,
                     role=MembershipRole.TECHNICIAN,
                 ).exists()
@@ -217,8 +226,8 @@ class BuildingForm(forms.ModelForm):
 
     # helper methods -----------------------------------------------------
 
-    def _determine_owner_candidate(self):
-        owner_user = getattr(self.instance, "owner", None)
+    def _determine_owner_candidate_id(self):
+        owner_id = getattr(self.instance, "owner_id", None)
         if self._can_assign_owner:
             owner_field_name = self.add_prefix("owner")
             owner_value = None
@@ -226,38 +235,36 @@ class BuildingForm(forms.ModelForm):
                 owner_value = self.data.get(owner_field_name)
             owner_value = owner_value or self.initial.get("owner")
             if owner_value:
+                owner_pk = getattr(owner_value, "pk", owner_value)
                 try:
-                    owner_user = User.objects.get(pk=owner_value)
-                except (User.DoesNotExist, ValueError, TypeError):
-                    pass
+                    owner_pk = int(owner_pk)
+                except (TypeError, ValueError):
+                    owner_pk = None
+                if owner_pk is not None:
+                    # Users outside the technician queryset fail field validation anyway.
+                    owner_id = owner_pk if owner_pk in self._owner_technician_ids else None
         elif self._user is not None:
-            owner_user = self._user
-        return owner_user
+            owner_id = self._user.pk
+        return owner_id
 
     def _user_can_assign_owner(self, user):
         if not user or not getattr(user, "is_authenticated", False):
             return False
         if getattr(user, "is_superuser", False):
             return True
-        return BuildingMembership.objects.filter(
-            user=user,
-            role__in=[MembershipRole.ADMINISTRATOR, MembershipRole.BACKOFFICE],
-        ).exists()
+        return not user_roles(user).isdisjoint((MembershipRole.ADMINISTRATOR, MembershipRole.BACKOFFICE))
 
     def _user_is_admin(self, user):
         if not user or not getattr(user, "is_authenticated", False):
             return False
         if getattr(user, "is_superuser", False):
             return True
-        memberships = BuildingMembership.objects.filter(
-            user=user,
-            role=MembershipRole.ADMINISTRATOR,
+        building_id = getattr(self.instance, "pk", None)
+        return any(
+            role == MembershipRole.ADMINISTRATOR
+            and (membership_building_id is None or (building_id and membership_building_id == building_id))
+            for membership_building_id, role in resolver_for(user).membership_rows
         )
-        if getattr(self.instance, "pk", None):
-            memberships = memberships.filter(Q(building__isnull=True) | Q(building=self.instance))
-        else:
-            memberships = memberships.filter(building__isnull=True)
-        return memberships.exists()
 
 
 class TodoItemForm(forms.ModelForm):
@@ -265,8 +272,12 @@ class TodoItemForm(forms.ModelForm):
         model = TodoItem
         fields = ["title", "status", "due_date", "description"]
         widgets = {
-            "description": forms.Textarea(attrs={"rows": 4}),
-            "due_date": forms.DateInput(attrs={"type": "date"}),
+            "title": forms.TextInput(attrs={"class": "input"}),
+            "status": forms.Select(attrs={"class": "input"}),
+            "description": forms.Textarea(attrs={"rows": 4, "class": "input"}),
+            "due_date": forms.DateInput(
+                attrs={"type": "date", "class": "input", "data-date-placeholder": _("dd.mm.yyyy")}
+            ),
         }
 
     def __init__(self, *args, user=None, **kwargs):
@@ -276,15 +287,10 @@ class TodoItemForm(forms.ModelForm):
         self.fields["status"].choices = [
             choice for choice in TodoItem.Status.choices if choice[0] != TodoItem.Status.ARCHIVED
         ]
-        self.fields["title"].widget.attrs.setdefault("class", "input")
         self.fields["title"].label = _("Title")
-        self.fields["status"].widget.attrs.setdefault("class", "input")
         self.fields["status"].label = _("Status")
-        self.fields["due_date"].widget.attrs.setdefault("class", "input")
         self.fields["due_date"].widget.attrs.setdefault("min", timezone.localdate().isoformat())
         self.fields["due_date"].label = _("Date")
-        self.fields["due_date"].widget.attrs.setdefault("data-date-placeholder", _("dd.mm.yyyy"))
-        self.fields["description"].widget.attrs.setdefault("class", "input")
         self.fields["description"].label = _("Description")
         if self._can_assign_owner:
             owner_field = forms.ModelChoiceField(
@@ -348,6 +354,12 @@ class TodoItemForm(forms.ModelForm):
 # -----------------------------
 # Units
 # -----------------------------
+# Every Unit field except those in the per-building number constraint.
+_UNIT_NUMBER_CONSTRAINT_EXCLUDE = frozenset(
+    field.name for field in Unit._meta.concrete_fields if field.name not in {"number", "building"}
+)
+
+
 class UnitForm(forms.ModelForm):
     class Meta:
         model = Unit
@@ -357,7 +369,7 @@ class UnitForm(forms.ModelForm):
     def __init__(self, *args, user=None, building=None, **kwargs):
         # ALWAYS set these attributes so save() never fails
         self._user = user
-        self._resolver = CapabilityResolver(user) if user and user.is_authenticated else None
+        self._resolver = resolver_for(user) if user and user.is_authenticated else None
         self._building = building
         self._resolved_building = None
         super().__init__(*args, **kwargs)
@@ -379,30 +391,32 @@ class UnitForm(forms.ModelForm):
             return self._resolved_building
         candidate = self._building or self.cleaned_data.get("building") or getattr(self.instance, "building", None)
         if candidate and not isinstance(candidate, Building):
-            try:
-                candidate = Building.objects.get(pk=candidate)
-            except (Building.DoesNotExist, TypeError, ValueError):
-                candidate = None
+            instance_building_id = getattr(self.instance, "building_id", None)
+            if instance_building_id is not None and str(instance_building_id) == str(candidate):
+                candidate = self.instance.building
+            else:
+                try:
+                    candidate = Building.objects.get(pk=candidate)
+                except (Building.DoesNotExist, TypeError, ValueError):
+                    candidate = None
         self._resolved_building = candidate
         return self._resolved_building
 
     def clean_number(self):
-        number = (self.cleaned_data.get("number") or "").strip()
+        return (self.cleaned_data.get("number") or "").strip()
 
+    def validate_unique(self):
+        super().validate_unique()
         # Decide which building to validate against without touching a missing relation
         building = self._resolve_building()
-        building_id = getattr(building, "pk", None)
-
-        # Enforce uniqueness only when we know the building
-        if building_id and number:
-            qs = Unit.objects.filter(building_id=building_id, number__iexact=number)
-            if self.instance.pk:
-                qs = qs.exclude(pk=self.instance.pk)
-            if qs.exists():
-                raise forms.ValidationError(
-                    _("Apartment number must be unique within this building.")
-                )
-        return number
+        if getattr(building, "pk", None) is None or not self.cleaned_data.get("number"):
+            return
+        # "building" is not a form field, so Django skips the per-building constraint.
+        self.instance.building = building
+        try:
+            self.instance.validate_constraints(exclude=_UNIT_NUMBER_CONSTRAINT_EXCLUDE)
+        except forms.ValidationError as exc:
+            self.add_error("number", exc.messages)
 
     def clean(self):
         cleaned = super().clean()
@@ -412,8 +426,8 @@ class UnitForm(forms.ModelForm):
             building_id = getattr(building, "pk", None)
             allowed = False
             if self._resolver:
-                allowed = self._resolver.has(Capability.MANAGE_BUILDINGS, building_id=building_id) or self._resolver.has(
-                    Capability.CREATE_UNITS, building_id=building_id
+                allowed = self._resolver.has_any(
+                    Capability.MANAGE_BUILDINGS, Capability.CREATE_UNITS, building_id=building_id
                 )
             if not allowed:
                 self.add_error(
@@ -438,6 +452,25 @@ class UnitForm(forms.ModelForm):
 # Work Orders
 # -----------------------------
 
+_ATTACHMENT_LABEL_TEMPLATE = (
+    '<span class="flex items-center gap-2">'
+    '<a href="{url}" target="_blank" rel="noopener noreferrer" class="link">{name}</a>'
+    '<span class="text-xs text-slate-500 dark:text-slate-400">({size})</span>'
+    '</span>'
+)
+_APPROVAL_STATUS_CHOICES = (
+    (WorkOrder.Status.DONE, WorkOrder.Status.DONE.label),
+    (WorkOrder.Status.REJECTED, WorkOrder.Status.REJECTED.label),
+    (WorkOrder.Status.APPROVED, WorkOrder.Status.APPROVED.label),
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _status_choices_for(allowed: frozenset) -> tuple:
+    """Return ``WorkOrder.Status.choices`` limited to ``allowed``; only a handful of sets ever occur."""
+    return tuple(choice for choice in WorkOrder.Status.choices if choice[0] in allowed)
+
+
 class WorkOrderForm(forms.ModelForm):
     """
     Usage from views:
@@ -516,7 +549,7 @@ class WorkOrderForm(forms.ModelForm):
         self.show_office_employee = False
         self._existing_attachments = []
         self._attachment_lookup: dict[str, WorkOrderAttachment] = {}
-        self._resolver = CapabilityResolver(user) if user and user.is_authenticated else None
+        self._resolver = resolver_for(user) if user and user.is_authenticated else None
         self._forward_target_initial = getattr(kwargs.get("instance"), "forwarded_to_building_id", None)
         self._forward_target_obj = None
         self._forwarding_owner_map: dict[str, str] = {}
@@ -571,14 +604,26 @@ class WorkOrderForm(forms.ModelForm):
                 or self.initial.get("building")
                 or getattr(self.instance, "building_id", None)
         )
-        effective_building_obj = self._coerce_building(effective_b)
-        b_id = effective_building_obj.pk if effective_building_obj else self._resolve_building_id(effective_b)
+        effective_id = self._resolve_building_id(effective_b)
+        if self._building is not None:
+            effective_building_obj = self._locked_building_obj
+        elif effective_id is not None and effective_id == getattr(self.instance, "building_id", None):
+            effective_building_obj = self.instance.building
+        else:
+            effective_building_obj = self._coerce_building(effective_b)
+        b_id = effective_building_obj.pk if effective_building_obj else effective_id
         self._effective_building = effective_building_obj
         self.show_office_employee = bool(
             effective_building_obj and getattr(effective_building_obj, "is_system_default", False)
         )
+        # Option labels use Unit.__str__, which includes the building name.
         self.fields["unit"].queryset = (
-            Unit.objects.filter(building_id=b_id).order_by("number") if b_id else Unit.objects.none()
+            Unit.objects.filter(building_id=b_id)
+            .select_related("building")
+            .only("id", "number", "building__name")
+            .order_by("number")
+            if b_id
+            else Unit.objects.none()
         )
         if b_id:
             self.fields["unit"].widget.attrs.pop("disabled", None)
@@ -624,25 +669,15 @@ class WorkOrderForm(forms.ModelForm):
             self, b_id, current_status=self._current_status, can_user_approve=self._can_user_approve
         )
         if self._current_status == WorkOrder.Status.AWAITING_APPROVAL and self._can_user_approve:
-            self._allowed_status_values = {
-                WorkOrder.Status.DONE,
-                WorkOrder.Status.APPROVED,
-                WorkOrder.Status.REJECTED,
-            }
-            self.fields["status"].choices = [
-                (WorkOrder.Status.DONE, WorkOrder.Status.DONE.label),
-                (WorkOrder.Status.REJECTED, WorkOrder.Status.REJECTED.label),
-                (WorkOrder.Status.APPROVED, WorkOrder.Status.APPROVED.label),
-            ]
+            self._allowed_status_values = _WORKORDER_APPROVAL_STATUSES
+            self.fields["status"].choices = _APPROVAL_STATUS_CHOICES
         else:
-            self.fields["status"].choices = [
-                choice for choice in WorkOrder.Status.choices if choice[0] in self._allowed_status_values
-            ]
+            self.fields["status"].choices = _status_choices_for(frozenset(self._allowed_status_values))
             if self._current_status == WorkOrder.Status.AWAITING_APPROVAL:
                 self.fields["status"].disabled = True
-                self.fields["status"].widget.attrs["class"] = (
-                    self.fields["status"].widget.attrs.get("class", "") + " cursor-not-allowed opacity-70"
-                ).strip()
+                self.fields["status"].widget.attrs["class"] = _merge_classes(
+                    self.fields["status"].widget.attrs.get("class", ""), "cursor-not-allowed opacity-70"
+                )
                 self.fields["status"].help_text = _(
                     "Awaiting backoffice approval. Only backoffice users can change this status."
                 )
@@ -650,8 +685,7 @@ class WorkOrderForm(forms.ModelForm):
         self.fields["replacement_request_note"].widget = forms.HiddenInput()
         self.fields["replacement_request_note"].required = False
         self.fields["replacement_request_note"].initial = ""
-        self._approver_queryset = _workorder_build_approver_queryset(self._effective_building)
-        self._approvers_available = self._approver_queryset.exists()
+        self._approvers_available = _workorder_has_approvers(self._effective_building)
 
         self.forwarding_enabled = bool(
             effective_building_obj
@@ -710,7 +744,9 @@ class WorkOrderForm(forms.ModelForm):
         # Attachments (delete existing)
         if self.instance.pk:
             attachments = list(
-                self.instance.attachments.order_by("-created_at").select_related(None)
+                self.instance.attachments.only("id", "original_name", "file", "size", "created_at").order_by(
+                    "-created_at"
+                )
             )
             if attachments:
                 self._existing_attachments = attachments
@@ -726,15 +762,7 @@ class WorkOrderForm(forms.ModelForm):
                         except ValueError:
                             url = ""
                     size_label = filesizeformat(attachment.size or 0)
-                    label_html = format_html(
-                        '<span class="flex items-center gap-2">'
-                        '<a href="{url}" target="_blank" rel="noopener noreferrer" class="link">{name}</a>'
-                        '<span class="text-xs text-slate-500 dark:text-slate-400">({size})</span>'
-                        '</span>',
-                        url=url,
-                        name=name,
-                        size=size_label,
-                    )
+                    label_html = format_html(_ATTACHMENT_LABEL_TEMPLATE, url=url, name=name, size=size_label)
                     choices.append((key, label_html))
                 self.fields["remove_attachments"] = forms.MultipleChoiceField(
                     required=False,
@@ -751,10 +779,11 @@ class WorkOrderForm(forms.ModelForm):
         # Prefer locked building when provided
         building = cleaned.get("building")
         if building is None and self._building is not None:
-            b_id = self._resolve_building_id(self._building)
-            building = self._coerce_building(self._building)
+            building = self._effective_building
         elif building is None and getattr(self.instance, "building_id", None):
-            building = getattr(self.instance, "building")
+            building = self._effective_building
+            if getattr(building, "pk", None) != self.instance.building_id:
+                building = self.instance.building
         building_id = getattr(building, "pk", None)
 
         unit = cleaned.get("unit")
@@ -772,16 +801,14 @@ class WorkOrderForm(forms.ModelForm):
         if self._user and building:
             allowed = False
             if self._resolver:
-                allowed = self._resolver.has(Capability.MANAGE_BUILDINGS, building_id=building_id) or self._resolver.has(
-                    Capability.CREATE_WORK_ORDERS, building_id=building_id
+                allowed = self._resolver.has_any(
+                    Capability.MANAGE_BUILDINGS, Capability.CREATE_WORK_ORDERS, building_id=building_id
                 )
                 if not allowed and getattr(self.instance, "pk", None):
                     destination_id = getattr(self.instance, "forwarded_to_building_id", None)
                     if destination_id:
-                        allowed = self._resolver.has(
+                        allowed = self._resolver.has_any(
                             Capability.MANAGE_BUILDINGS,
-                            building_id=destination_id,
-                        ) or self._resolver.has(
                             Capability.CREATE_WORK_ORDERS,
                             building_id=destination_id,
                         )
@@ -809,7 +836,7 @@ class WorkOrderForm(forms.ModelForm):
 
         if (
             original_status == WorkOrder.Status.AWAITING_APPROVAL
-            and status_value in {WorkOrder.Status.DONE, WorkOrder.Status.APPROVED, WorkOrder.Status.REJECTED}
+            and status_value in _WORKORDER_APPROVAL_STATUSES
         ):
             if not self._can_user_approve:
                 self.add_error("status", _("You do not have permission to complete this approval."))
@@ -1078,7 +1105,9 @@ class WorkOrderForm(forms.ModelForm):
                     name = Path(attachment.file.name).name
                 if name:
                     change_log["removed"].append(name)
-                attachment.delete()
+            if to_delete:
+                # Attachments have no delete hooks, so a queryset delete is safe.
+                WorkOrderAttachment.objects.filter(pk__in=[attachment.pk for attachment in to_delete]).delete()
 
         new_files = self.cleaned_data.get("new_attachments", []) if hasattr(self, "cleaned_data") else []
         for uploaded in new_files:
@@ -1100,6 +1129,57 @@ class WorkOrderForm(forms.ModelForm):
 # Helper functions
 # -----------------------------
 
+_WORKORDER_STATUS_TRANSITIONS = MappingProxyType(
+    {
+        WorkOrder.Status.OPEN: frozenset(
+            {WorkOrder.Status.OPEN, WorkOrder.Status.IN_PROGRESS, WorkOrder.Status.DONE}
+        ),
+        WorkOrder.Status.IN_PROGRESS: frozenset(
+            {
+                WorkOrder.Status.IN_PROGRESS,
+                WorkOrder.Status.AWAITING_APPROVAL,
+                WorkOrder.Status.DONE,
+            }
+        ),
+        WorkOrder.Status.AWAITING_APPROVAL: frozenset({WorkOrder.Status.AWAITING_APPROVAL}),
+        WorkOrder.Status.DONE: frozenset({WorkOrder.Status.DONE}),
+        WorkOrder.Status.APPROVED: frozenset(
+            {
+                WorkOrder.Status.APPROVED,
+                WorkOrder.Status.OPEN,
+                WorkOrder.Status.IN_PROGRESS,
+                WorkOrder.Status.AWAITING_APPROVAL,
+                WorkOrder.Status.DONE,
+            }
+        ),
+        WorkOrder.Status.REJECTED: frozenset(
+            {
+                WorkOrder.Status.REJECTED,
+                WorkOrder.Status.OPEN,
+                WorkOrder.Status.IN_PROGRESS,
+                WorkOrder.Status.AWAITING_APPROVAL,
+                WorkOrder.Status.DONE,
+            }
+        ),
+    }
+)
+_WORKORDER_APPROVAL_STATUSES = frozenset(
+    {
+        WorkOrder.Status.DONE,
+        WorkOrder.Status.APPROVED,
+        WorkOrder.Status.REJECTED,
+    }
+)
+_WORKORDER_APPROVER_EXTRA_STATUSES = frozenset(
+    {
+        WorkOrder.Status.OPEN,
+        WorkOrder.Status.IN_PROGRESS,
+        WorkOrder.Status.AWAITING_APPROVAL,
+        WorkOrder.Status.DONE,
+    }
+)
+
+
 def _workorder_allowed_statuses(form, building_id, *, current_status=None, can_user_approve: bool = False):
     current = current_status or (form.instance.status if form.instance.pk else WorkOrder.Status.OPEN)
     resolver = getattr(form, "_resolver", None)
@@ -1121,78 +1201,36 @@ def _workorder_allowed_statuses(form, building_id, *, current_status=None, can_u
     if not (can_manage or can_create or can_user_approve):
         return {current}
 
-    transitions = {
-        WorkOrder.Status.OPEN: {WorkOrder.Status.OPEN, WorkOrder.Status.IN_PROGRESS, WorkOrder.Status.DONE},
-        WorkOrder.Status.IN_PROGRESS: {
-            WorkOrder.Status.IN_PROGRESS,
-            WorkOrder.Status.AWAITING_APPROVAL,
-            WorkOrder.Status.DONE,
-        },
-        WorkOrder.Status.AWAITING_APPROVAL: {WorkOrder.Status.AWAITING_APPROVAL},
-        WorkOrder.Status.DONE: {WorkOrder.Status.DONE},
-        WorkOrder.Status.APPROVED: {
-            WorkOrder.Status.APPROVED,
-            WorkOrder.Status.OPEN,
-            WorkOrder.Status.IN_PROGRESS,
-            WorkOrder.Status.AWAITING_APPROVAL,
-            WorkOrder.Status.DONE,
-        },
-        WorkOrder.Status.REJECTED: {
-            WorkOrder.Status.REJECTED,
-            WorkOrder.Status.OPEN,
-            WorkOrder.Status.IN_PROGRESS,
-            WorkOrder.Status.AWAITING_APPROVAL,
-            WorkOrder.Status.DONE,
-        },
-    }
-    allowed = transitions.get(current, {current})
+    allowed = _WORKORDER_STATUS_TRANSITIONS.get(current, frozenset({current}))
     if current == WorkOrder.Status.AWAITING_APPROVAL:
         if can_user_approve:
-            return {
-                WorkOrder.Status.DONE,
-                WorkOrder.Status.APPROVED,
-                WorkOrder.Status.REJECTED,
-            }
+            return _WORKORDER_APPROVAL_STATUSES
         return allowed
     if can_user_approve:
-        allowed |= {
-            WorkOrder.Status.OPEN,
-            WorkOrder.Status.IN_PROGRESS,
-            WorkOrder.Status.AWAITING_APPROVAL,
-            WorkOrder.Status.DONE,
-        }
+        allowed = allowed | _WORKORDER_APPROVER_EXTRA_STATUSES
     return allowed
 
 
-def _workorder_build_approver_queryset(building: Building | None):
+def _workorder_has_approvers(building: Building | None) -> bool:
     if not building:
-        return User.objects.none()
-    user_ids: set[int] = set()
-    user_ids.update(
-        BuildingMembership.objects.filter(
-            building=building,
-            role=MembershipRole.BACKOFFICE,
-        ).values_list("user_id", flat=True)
-    )
-    user_ids.update(
-        BuildingMembership.objects.filter(
-            building__isnull=True,
-            role=MembershipRole.ADMINISTRATOR,
-        ).values_list("user_id", flat=True)
+        return False
+    membership_filter = Q(building=building, role=MembershipRole.BACKOFFICE) | Q(
+        building__isnull=True, role=MembershipRole.ADMINISTRATOR
     )
     if building.owner_id:
-        owner_roles = list(
-            BuildingMembership.objects.filter(
-                building=building,
-                user_id=building.owner_id,
-            ).values_list("role", flat=True)
-        )
-        if owner_roles and MembershipRole.TECHNICIAN not in owner_roles:
-            user_ids.add(building.owner_id)
-    user_ids.discard(None)
-    if not user_ids:
-        return User.objects.none()
-    return User.objects.filter(pk__in=user_ids, is_active=True).order_by(Lower("username"))
+        membership_filter |= Q(building=building, user_id=building.owner_id)
+    owner_roles: set[str] = set()
+    rows = BuildingMembership.objects.filter(membership_filter, user__is_active=True).values_list(
+        "user_id", "building_id", "role"
+    )
+    for user_id, building_id, role in rows:
+        if (building_id == building.pk and role == MembershipRole.BACKOFFICE) or (
+            building_id is None and role == MembershipRole.ADMINISTRATOR
+        ):
+            return True
+        if building_id == building.pk and user_id == building.owner_id:
+            owner_roles.add(role)
+    return bool(owner_roles) and MembershipRole.TECHNICIAN not in owner_roles
 
 
 # -----------------------------
@@ -1342,9 +1380,9 @@ class BudgetExpenseForm(forms.ModelForm):
 
 
 class BudgetFilterForm(forms.Form):
-    status = forms.ChoiceField(required=False)
+    status = forms.ChoiceField(required=False, widget=forms.Select(attrs={"class": "input"}))
     technician = forms.ModelChoiceField(queryset=User.objects.none(), required=False, label=_("Requester"))
-    q = forms.CharField(required=False, label=_("Search"))
+    q = forms.CharField(required=False, label=_("Search"), widget=forms.TextInput(attrs={"class": "input"}))
     date_from = forms.DateField(
         required=False,
         label=_("From"),
@@ -1360,6 +1398,7 @@ class BudgetFilterForm(forms.Form):
         label=_("Page size"),
         coerce=int,
         choices=((20, "20"), (50, "50"), (100, "100")),
+        widget=forms.Select(attrs={"class": "input"}),
     )
     show_requester = False
 
@@ -1368,11 +1407,6 @@ class BudgetFilterForm(forms.Form):
         super().__init__(*args, **kwargs)
         status_choices = [("", _("All statuses"))] + list(BudgetRequest.Status.choices)
         self.fields["status"].choices = status_choices
-        self.fields["q"].widget.attrs.setdefault("class", "input")
-        self.fields["status"].widget.attrs.setdefault("class", "input")
-        self.fields["date_from"].widget.attrs.setdefault("class", "input")
-        self.fields["date_to"].widget.attrs.setdefault("class", "input")
-        self.fields["per"].widget.attrs.setdefault("class", "input")
         current_user_id = getattr(user, "pk", None)
         tech_qs = User.objects.filter(
             Q(budget_requests__isnull=False) | Q(pk=current_user_id)
@@ -1623,15 +1657,24 @@ class MassAssignWorkOrdersForm(forms.Form):
         super().__init__(*args, **kwargs)
         self._user = user
 
-        qs = buildings_queryset or Building.objects.none()
+        qs = buildings_queryset if buildings_queryset is not None else Building.objects.none()
+        if not qs.query.select_related:
+            # Labels show the owner; only clone when the caller did not join it already, so a
+            # caller's evaluated queryset keeps its result cache.
+            qs = qs.select_related("owner")
         field = self.fields["buildings"]
         field.queryset = qs
         field.widget.attrs.setdefault("class", "space-y-2")
 
-        if qs.exists():
-            if not self.is_bound:
-                field.initial = list(qs.values_list("pk", flat=True))
+        if self.is_bound:
+            has_buildings = qs.exists()
         else:
+            # Iterating fills qs's result cache, which the mass-assign view reuses for its list.
+            building_pks = [building.pk for building in qs]
+            has_buildings = bool(building_pks)
+            if building_pks:
+                field.initial = building_pks
+        if not has_buildings:
             field.disabled = True
 
         if not self.is_bound:
@@ -1658,24 +1701,31 @@ class MassAssignWorkOrdersForm(forms.Form):
         return buildings
 
 
-class BuildingMembershipForm(forms.Form):
-    allowed_roles = {
+_MEMBERSHIP_ROLE_LABELS = dict(MembershipRole.choices)
+_ASSIGNABLE_MEMBERSHIP_ROLES = frozenset(
+    {
         MembershipRole.TECHNICIAN,
         MembershipRole.BACKOFFICE,
         MembershipRole.LAWYER,
     }
+)
+_ASSIGNABLE_MEMBERSHIP_ROLE_CHOICES = tuple(
+    (value, label) for value, label in MembershipRole.choices if value in _ASSIGNABLE_MEMBERSHIP_ROLES
+)
+_TECHNICIAN_SUBROLE_VALUES = frozenset(value for value, _label in Building.Role.choices)
+
+
+class BuildingMembershipForm(forms.Form):
+    allowed_roles = _ASSIGNABLE_MEMBERSHIP_ROLES
+    technician_subrole_choices = tuple(Building.Role.choices)
 
     def __init__(self, *args, building=None, **kwargs):
         self._building = building
         super().__init__(*args, **kwargs)
+        self._subrole_prefix = self.add_prefix("subrole_user_")
 
-        role_choices = [
-            (value, label)
-            for value, label in MembershipRole.choices
-            if value in self.allowed_roles
-        ]
         self.fields["role"] = forms.ChoiceField(
-            choices=[("", _("Select a role"))] + role_choices,
+            choices=[("", _("Select a role")), *_ASSIGNABLE_MEMBERSHIP_ROLE_CHOICES],
             label=_("Role"),
             required=True,
         )
@@ -1687,27 +1737,22 @@ class BuildingMembershipForm(forms.Form):
                 is_active=True,
             )
             .distinct()
+            .only("id", "username", "first_name", "last_name")
             .order_by(Lower("username"))
         )
-        self._eligible_user_ids = list(eligible_users_qs.values_list("pk", flat=True))
-        role_display_lookup = dict(MembershipRole.choices)
-        user_roles_qs = BuildingMembership.objects.filter(
-            user_id__in=self._eligible_user_ids,
+        self._eligible_user_ids: set[int] = set(eligible_users_qs.order_by().values_list("pk", flat=True))
+        global_role_rows = BuildingMembership.objects.filter(
+            user__is_active=True,
             building__isnull=True,
             role__in=self.allowed_roles,
-        ).order_by("user_id")
-        self._user_role_map: dict[str, list[str]] = {}
-        self._user_role_labels: dict[str, list[str]] = {}
-        for membership in user_roles_qs:
-            key = str(membership.user_id)
-            role_code = membership.role
-            role_label = role_display_lookup.get(role_code, role_code)
-            self._user_role_map.setdefault(key, [])
-            self._user_role_labels.setdefault(key, [])
-            if role_code not in self._user_role_map[key]:
-                self._user_role_map[key].append(role_code)
-            if role_label not in self._user_role_labels[key]:
-                self._user_role_labels[key].append(role_label)
+        ).order_by().values_list("user_id", "role")
+        global_roles: dict[str, dict[str, str]] = {}
+        for user_id, role_code in global_role_rows:
+            global_roles.setdefault(str(user_id), {})[role_code] = _MEMBERSHIP_ROLE_LABELS.get(role_code, role_code)
+        self._user_role_map: dict[str, list[str]] = {key: list(roles) for key, roles in global_roles.items()}
+        self._user_role_labels: dict[str, list[str]] = {
+            key: list(roles.values()) for key, roles in global_roles.items()
+        }
 
         user_field = forms.ModelMultipleChoiceField(
             queryset=eligible_users_qs,
@@ -1738,18 +1783,19 @@ class BuildingMembershipForm(forms.Form):
             )
         self.fields["user"] = user_field
 
-        self.technician_subrole_choices = list(Building.Role.choices)
         self.selected_subroles: dict[str, str] = {}
         if self.is_bound:
-            for user_id in self._eligible_user_ids:
-                key = str(user_id)
-                field_name = self.subrole_field_name(user_id)
-                value = (self.data.get(field_name) or "").strip()
-                if value:
+            prefix = self._subrole_prefix
+            for field_name, value in self.data.items():
+                if not field_name.startswith(prefix):
+                    continue
+                key = field_name[len(prefix):]
+                value = (value or "").strip()
+                if value and key.isdigit() and int(key) in self._eligible_user_ids and str(int(key)) == key:
                     self.selected_subroles[key] = value
 
     def subrole_field_name(self, user_id: int) -> str:
-        return self.add_prefix(f"subrole_user_{user_id}")
+        return f"{self._subrole_prefix}{user_id}"
 
     def clean(self):
         cleaned = super().clean()
@@ -1764,7 +1810,6 @@ class BuildingMembershipForm(forms.Form):
             self.add_error("user", _("Select at least one user."))
             return cleaned
 
-        role_label_lookup = dict(MembershipRole.choices)
         for user in users:
             key = str(user.pk)
             user_roles = self._user_role_map.get(key, [])
@@ -1772,19 +1817,16 @@ class BuildingMembershipForm(forms.Form):
                 self.add_error(
                     "user",
                     _("All selected users must have the %(role)s role.") % {
-                        "role": role_label_lookup.get(role, role)
+                        "role": _MEMBERSHIP_ROLE_LABELS.get(role, role)
                     },
                 )
                 return cleaned
 
         subrole_map: dict[int, str] = {}
         if role == MembershipRole.TECHNICIAN:
-            valid_values = {value for value, _ in self.technician_subrole_choices}
             for user in users:
-                key = str(user.pk)
-                field_name = self.subrole_field_name(user.pk)
-                subrole_value = (self.data.get(field_name) or "").strip()
-                if subrole_value not in valid_values:
+                subrole_value = self.selected_subroles.get(str(user.pk), "")
+                if subrole_value not in _TECHNICIAN_SUBROLE_VALUES:
                     self.add_error(
                         "user",
                         _("Select a sub-role for %(user)s.") % {
@@ -1796,15 +1838,17 @@ class BuildingMembershipForm(forms.Form):
         cleaned["technician_subroles_map"] = subrole_map
 
         if self._building and users:
-            duplicates = BuildingMembership.objects.filter(
-                building=self._building,
-                user__in=users,
-                role=role,
-            ).select_related("user")
-            if duplicates.exists():
+            duplicates = list(
+                BuildingMembership.objects.filter(
+                    building=self._building,
+                    user__in=users,
+                    role=role,
+                ).values_list("user__first_name", "user__last_name", "user__username")
+            )
+            if duplicates:
                 names = ", ".join(
-                    membership.user.get_full_name() or membership.user.username
-                    for membership in duplicates
+                    f"{first_name} {last_name}".strip() or username
+                    for first_name, last_name, username in duplicates
                 )
                 self.add_error(
                     "user",
@@ -1830,9 +1874,18 @@ class BuildingMembershipForm(forms.Form):
                 role=role,
                 technician_subrole=subrole_map.get(user.pk, ""),
             )
-            if commit:
-                membership.save()
             memberships.append(membership)
+        if commit and memberships:
+            if building is None:
+                # Global memberships fan out through post_save signals; keep per-row saves.
+                for membership in memberships:
+                    membership.save()
+            else:
+                # bulk_create skips save(); clean() already checked eligibility and duplicates.
+                for membership in memberships:
+                    membership.normalize_for_save()
+                with transaction.atomic():
+                    BuildingMembership.objects.bulk_create(memberships)
         return memberships
 
 
@@ -1861,6 +1914,13 @@ class TechnicianSubroleForm(forms.ModelForm):
 
 _USER_IS_ACTIVE_FIELD = User._meta.get_field("is_active")
 _USER_SUPERUSER_FIELD = User._meta.get_field("is_superuser")
+_USER_WIDGET_CSS_CLASSES = {forms.CheckboxInput: "checkbox"}
+
+
+def _apply_user_widget_classes(fields) -> None:
+    for field in fields.values():
+        widget = field.widget
+        widget.attrs.setdefault("class", _USER_WIDGET_CSS_CLASSES.get(type(widget), "input"))
 
 
 def _global_membership_for(user):
@@ -1870,14 +1930,14 @@ def _global_membership_for(user):
 
 
 def _initial_role_for(user):
-    qs = (
-        BuildingMembership.objects.filter(user=user, building__isnull=True)
-        if getattr(user, "pk", None)
-        else None
-    )
-    membership = qs.first() if qs is not None else None
-    if membership:
-        return membership.role
+    if getattr(user, "pk", None):
+        role = (
+            BuildingMembership.objects.filter(user=user, building__isnull=True)
+            .values_list("role", flat=True)
+            .first()
+        )
+        if role:
+            return role
     if getattr(user, "is_superuser", False):
         return MembershipRole.ADMINISTRATOR
     return MembershipRole.BACKOFFICE
@@ -1887,8 +1947,8 @@ def _apply_user_role(user, role: str | None):
     role = role or MembershipRole.BACKOFFICE
     user.is_superuser = role == MembershipRole.ADMINISTRATOR
     user.is_staff = user.is_superuser
-    user.save(update_fields=["is_superuser", "is_staff"])
     with transaction.atomic():
+        user.save(update_fields=["is_superuser", "is_staff"])
         memberships = BuildingMembership.objects.filter(user=user)
 
         # Keep role updates conflict-safe by harmonizing all memberships first.
@@ -1929,12 +1989,7 @@ class AdminUserCreateForm(RoleSelectionMixin, UserCreationForm):
             initial=_initial_role_for(self.instance),
             widget=forms.RadioSelect(attrs={"class": "space-y-2"}),
         )
-        for field in self.fields.values():
-            widget = field.widget
-            if isinstance(widget, forms.CheckboxInput):
-                widget.attrs.setdefault("class", "checkbox")
-            else:
-                widget.attrs.setdefault("class", "input")
+        _apply_user_widget_classes(self.fields)
         if "email" in self.fields:
             self.fields["email"].help_text = _("Optional, used for contact and password resets.")
         self.fields["is_active"].label = capfirst(_USER_IS_ACTIVE_FIELD.verbose_name)
@@ -1949,8 +2004,7 @@ class AdminUserCreateForm(RoleSelectionMixin, UserCreationForm):
         if commit:
             user.save()
             self.save_m2m()
-            profile, created = UserSecurityProfile.objects.get_or_create(user=user)
-            profile.reset()
+            UserSecurityProfile.reset_for(user)
             _apply_user_role(user, self.cleaned_data.get("role"))
         return user
 
@@ -1977,23 +2031,19 @@ class AdminUserUpdateForm(RoleSelectionMixin, UserChangeForm):
             initial=_initial_role_for(self.instance),
             widget=forms.RadioSelect(attrs={"class": "space-y-2"}),
         )
-        for field in self.fields.values():
-            widget = field.widget
-            if isinstance(widget, forms.CheckboxInput):
-                widget.attrs.setdefault("class", "checkbox")
-            else:
-                widget.attrs.setdefault("class", "input")
+        _apply_user_widget_classes(self.fields)
 
     def save(self, commit=True):
         user = super().save(commit=False)
-        role = self.cleaned_data.get("role", _initial_role_for(user))
+        role = self.cleaned_data.get("role", self.fields["role"].initial)
         user.is_staff = user.is_superuser
         if commit:
             user.save()
             self.save_m2m()
-            profile, created = UserSecurityProfile.objects.get_or_create(user=user)
             if user.is_active:
-                profile.reset()
+                UserSecurityProfile.reset_for(user)
+            else:
+                UserSecurityProfile.objects.get_or_create(user=user)
             _apply_user_role(user, role)
         return user
 
@@ -33,27 +33,23 @@ def _missing_schema_for_core() -> tuple[set[str], dict[str, set[str]]]:
     Returns:
       (missing_tables, missing_columns_by_table)
     """
-    with connection.cursor() as cursor:
-        existing_tables = set(connection.introspection.table_names(cursor))
-
     core_models = list(apps.get_app_config("core").get_models())
     table_by_model = {m._meta.db_table: m for m in core_models}
     required_tables = set(table_by_model.keys())
-
-    missing_tables = required_tables - existing_tables
     missing_columns_by_table: dict[str, set[str]] = {}
 
-    for table, model in table_by_model.items():
-        if table in missing_tables:
-            continue  # table missing; columns check is irrelevant
-        # Collect columns present in DB
-        with connection.cursor() as cursor:
+    with connection.cursor() as cursor:
+        existing_tables = set(connection.introspection.table_names(cursor))
+        missing_tables = required_tables - existing_tables
+
+        for table, model in table_by_model.items():
+            if table in missing_tables:
+                continue  # table missing; columns check is irrelevant
             desc = connection.introspection.get_table_description(cursor, table)
-        existing_cols = {c.name for c in desc}
-        required_cols = _model_required_columns(model)
-        missing = required_cols - existing_cols
-        if missing:
-            missing_columns_by_table[table] = missing
+            existing_cols = {c.name for c in desc}
+            missing = _model_required_columns(model) - existing_cols
+            if missing:
+                missing_columns_by_table[table] = missing
 
     return missing_tables, missing_columns_by_table
 
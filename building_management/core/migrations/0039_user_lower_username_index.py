@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.db import migrations
+
+INDEX_NAME = "core_user_lower_username_idx"
+
+
+def _user_table(apps, schema_editor):
+    user_model = apps.get_model(settings.AUTH_USER_MODEL)
+    return schema_editor.quote_name(user_model._meta.db_table)
+
+
+def create_lower_username_index(apps, schema_editor):
+    # Pickers order users by Lower("username"); an expression index lets that sort use an index.
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON {_user_table(apps, schema_editor)} (LOWER(username))"
+    )
+
+
+def drop_lower_username_index(apps, schema_editor):
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0038_workorderattachment_thumbnail_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_lower_username_index, drop_lower_username_index),
+    ]
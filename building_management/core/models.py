@@ -60,9 +60,9 @@ def _resolve_visibility_scope(user):
         return "none", None, set()
     if getattr(user, "is_superuser", False):
         return "all", None, set()
-    from .authz import CapabilityResolver  # avoid circular import
+    from .authz import resolver_for  # avoid circular import
 
-    resolver = CapabilityResolver(user)
+    resolver = resolver_for(user)
     building_ids = resolver.visible_building_ids()
     if building_ids is None:
         return "all", resolver, set()
@@ -159,9 +159,9 @@ class WorkOrderQuerySet(models.QuerySet):
         if getattr(user, "is_superuser", False):
             return self
         if resolver is None:
-            from .authz import CapabilityResolver  # avoid circular import
+            from .authz import resolver_for  # avoid circular import
 
-            resolver = CapabilityResolver(user)
+            resolver = resolver_for(user)
         qs = self
         owner_filter = Q(building__owner_id=user.pk) | Q(forwarded_to_building__owner_id=user.pk)
         technician_assignment_filter = Q(
@@ -1916,6 +1916,16 @@ def _validate_capability_entries(values):
         )
 
 
+def resolve_role_capabilities(role: str, overrides: dict | None) -> set[str]:
+    """Role defaults plus/minus the membership overrides; mandatory capabilities always apply."""
+    defaults = ROLE_CAPABILITIES.get(role, set())
+    mandatory = ROLE_MANDATORY_CAPABILITIES.get(role, set())
+    overrides = overrides or {}
+    add = set(overrides.get("add", []))
+    remove = set(overrides.get("remove", []))
+    return ((set(defaults) | add) - remove) | set(mandatory)
+
+
 class BuildingMembership(TimeStampedModel):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -1953,12 +1963,7 @@ class BuildingMembership(TimeStampedModel):
 
     @cached_property
     def resolved_capabilities(self) -> set[str]:
-        defaults = ROLE_CAPABILITIES.get(self.role, set())
-        mandatory = ROLE_MANDATORY_CAPABILITIES.get(self.role, set())
-        overrides = self.capabilities_override or {}
-        add = set(overrides.get("add", []))
-        remove = set(overrides.get("remove", []))
-        return ((set(defaults) | add) - remove) | set(mandatory)
+        return resolve_role_capabilities(self.role, self.capabilities_override)
 
     def clean(self):
         super().clean()
@@ -1982,8 +1987,8 @@ class BuildingMembership(TimeStampedModel):
                 }
             )
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
+    def normalize_for_save(self) -> None:
+        """Validate and normalise overrides/sub-role; shared by save() and bulk inserts."""
         overrides = self.capabilities_override or {}
         _validate_capability_entries(overrides.get("add"))
         _validate_capability_entries(overrides.get("remove"))
@@ -1992,6 +1997,10 @@ class BuildingMembership(TimeStampedModel):
         self.capabilities_override = overrides
         if self.role != MembershipRole.TECHNICIAN:
             self.technician_subrole = ""
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        self.normalize_for_save()
         super().save(*args, **kwargs)
 
     @property
@@ -2117,6 +2126,13 @@ class UserSecurityProfile(models.Model):
         if commit:
             self.save(update_fields=["failed_login_attempts", "locked_at", "lock_reason"])
 
+    @classmethod
+    def reset_for(cls, user) -> None:
+        """Clear lockout state for ``user`` with one UPDATE, creating the profile if it is missing."""
+        updated = cls.objects.filter(user=user).update(failed_login_attempts=0, locked_at=None, lock_reason="")
+        if not updated:
+            cls.objects.create(user=user)
+
     @property
     def is_locked_for_failures(self) -> bool:
         return self.lock_reason == self.LockReason.FAILED_ATTEMPTS
@@ -1,6 +1,6 @@
 """Service-layer helpers for the core app."""
 
 from .budgets import BudgetExporter, BudgetNotificationService  # noqa: F401
-from .files import validate_work_order_attachment  # noqa: F401
+from .files import attachment_validation_config, validate_work_order_attachment  # noqa: F401
 from .notifications import NotificationPayload, NotificationService  # noqa: F401
 from .todos import TodoHistoryService, TodoArchiveService, TodoReminderService  # noqa: F401
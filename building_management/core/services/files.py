@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import mimetypes
 from dataclasses import dataclass
-from typing import Iterable
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured, ValidationError
@@ -14,12 +13,13 @@ from django.utils.module_loading import import_string
 @dataclass(frozen=True)
 class AttachmentValidationConfig:
     max_bytes: int
-    allowed_mime_types: tuple[str, ...]
+    allowed_mime_types: frozenset[str]
     allowed_mime_prefixes: tuple[str, ...]
     enforce_type_check: bool
 
 
-def _config_from_settings() -> AttachmentValidationConfig:
+def attachment_validation_config() -> AttachmentValidationConfig:
+    """Parse the attachment policy from settings; callers validating a batch should reuse it."""
     max_bytes = getattr(settings, "WORK_ORDER_ATTACHMENT_MAX_BYTES", 10 * 1024 * 1024)
     if max_bytes <= 0:
         raise ImproperlyConfigured("WORK_ORDER_ATTACHMENT_MAX_BYTES must be a positive integer.")
@@ -48,7 +48,7 @@ def _config_from_settings() -> AttachmentValidationConfig:
         tokens = raw_types.split(",")
     else:
         tokens = raw_types
-    allowed_types = tuple(sorted({str(t).strip().lower() for t in tokens if str(t).strip()}))
+    allowed_types = frozenset(str(t).strip().lower() for t in tokens if str(t).strip())
 
     raw_prefixes = getattr(
         settings,
@@ -59,7 +59,7 @@ def _config_from_settings() -> AttachmentValidationConfig:
         tokens = raw_prefixes.split(",")
     else:
         tokens = raw_prefixes
-    allowed_prefixes = tuple(sorted({str(p).strip().lower() for p in tokens if str(p).strip()}))
+    allowed_prefixes = tuple(dict.fromkeys(str(p).strip().lower() for p in tokens if str(p).strip()))
 
     if not allowed_prefixes:
         allowed_prefixes = ("image/",)
@@ -104,21 +104,20 @@ def run_antivirus_scan(uploaded_file) -> None:
     scan_callable(uploaded_file)
 
 
-def _matches_type(mime: str, allowed_types: Iterable[str], allowed_prefixes: Iterable[str]) -> bool:
+def _matches_type(mime: str, allowed_types: frozenset[str], allowed_prefixes: tuple[str, ...]) -> bool:
     mime = (mime or "").lower()
-    if mime and any(mime == t for t in allowed_types):
-        return True
-    if mime and any(mime.startswith(prefix) for prefix in allowed_prefixes):
-        return True
-    return False
+    if not mime:
+        return False
+    return mime in allowed_types or mime.startswith(allowed_prefixes)
 
 
-def validate_work_order_attachment(uploaded_file) -> None:
+def validate_work_order_attachment(uploaded_file, *, config: AttachmentValidationConfig | None = None) -> None:
     """
     Validate uploaded files for WorkOrderAttachment.
     Raises ValidationError when input violates policies.
     """
-    config = _config_from_settings()
+    if config is None:
+        config = attachment_validation_config()
 
     size = getattr(uploaded_file, "size", 0) or 0
     if size > config.max_bytes:
@@ -138,7 +137,7 @@ def validate_work_order_attachment(uploaded_file) -> None:
             ),
             params={
                 "mime": mime or _("unknown"),
-                "types": ", ".join(config.allowed_mime_types),
+                "types": ", ".join(sorted(config.allowed_mime_types)),
                 "prefixes": ", ".join(config.allowed_mime_prefixes),
             },
             code="invalid_file_type",
@@ -84,7 +84,7 @@ def _ensure_superuser_admin_membership(user):
 @receiver(post_save, sender=get_user_model())
 def ensure_security_profile(sender, instance, created, **kwargs):
     if created:
-        UserSecurityProfile.objects.get_or_create(user=instance)
+        UserSecurityProfile.objects.create(user=instance)
     _ensure_superuser_admin_membership(instance)
 
 
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.admin import NotificationAdmin
+from core.models import Building, Notification, WorkOrder
+
+
+class AdminChangelistTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.admin_user = User.objects.create_superuser(username="root", password="pass", email="root@example.com")
+        self.client.force_login(self.admin_user)
+        self.building = Building.objects.create(owner=self.admin_user, name="Tower", address="Main St 1")
+        self.work_order = WorkOrder.objects.create(
+            building=self.building,
+            title="Leaking pipe",
+            deadline=timezone.localdate(),
+        )
+        self.notification = Notification.objects.create(
+            user=self.admin_user,
+            key="test:key",
+            category="test",
+            title="Heads up",
+            body="Body",
+        )
+
+    def test_changelists_render_rows(self):
+        cases = (
+            ("admin:core_building_changelist", "Tower"),
+            ("admin:core_workorder_changelist", "Leaking pipe"),
+            ("admin:core_notification_changelist", "Heads up"),
+        )
+        for url_name, expected in cases:
+            with self.subTest(url_name=url_name):
+                response = self.client.get(reverse(url_name))
+                self.assertContains(response, expected)
+
+    def test_change_form_loads_full_row(self):
+        response = self.client.get(reverse("admin:core_workorder_change", args=(self.work_order.pk,)))
+        self.assertContains(response, "Leaking pipe")
+
+    def test_notification_active_column_matches_model(self):
+        snoozed = Notification.objects.create(
+            user=self.admin_user,
+            key="test:snoozed",
+            category="test",
+            title="Snoozed",
+            body="Body",
+            snoozed_until=timezone.localdate() + timedelta(days=1),
+        )
+        acknowledged = Notification.objects.create(
+            user=self.admin_user,
+            key="test:ack",
+            category="test",
+            title="Acknowledged",
+            body="Body",
+            acknowledged_at=timezone.now(),
+        )
+        request = RequestFactory().get("/")
+        request.user = self.admin_user
+        model_admin = NotificationAdmin(Notification, site)
+        rows = {obj.pk: obj for obj in model_admin.get_queryset(request)}
+
+        for notification in (self.notification, snoozed, acknowledged):
+            with self.subTest(title=notification.title):
+                self.assertEqual(
+                    model_admin.is_active_display(rows[notification.pk]),
+                    notification.is_active(),
+                )
+
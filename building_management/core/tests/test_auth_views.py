@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from core.auth_views import RoleAwareLoginView
+from core.models import UserSecurityProfile
+
+
+class LoginLockoutTests(TestCase):
+    def setUp(self):
+        self.User = get_user_model()
+        self.user = self.User.objects.create_user(username="tenant", password="correct-pass")
+        self.url = reverse("login")
+
+    def _fail_login(self):
+        return self.client.post(self.url, {"username": "tenant", "password": "wrong-pass"})
+
+    def test_failed_attempts_are_counted(self):
+        self._fail_login()
+        self._fail_login()
+
+        profile = UserSecurityProfile.objects.get(user=self.user)
+        self.assertEqual(profile.failed_login_attempts, 2)
+        self.assertEqual(profile.lock_reason, "")
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_active)
+
+    def test_threshold_locks_account(self):
+        for _ in range(RoleAwareLoginView.lock_threshold):
+            response = self._fail_login()
+
+        self.assertContains(response, "locked after too many failed attempts")
+        profile = UserSecurityProfile.objects.get(user=self.user)
+        self.assertEqual(profile.lock_reason, UserSecurityProfile.LockReason.FAILED_ATTEMPTS)
+        self.assertIsNotNone(profile.locked_at)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+
+    def test_missing_profile_is_created_on_failure(self):
+        UserSecurityProfile.objects.filter(user=self.user).delete()
+
+        self._fail_login()
+
+        profile = UserSecurityProfile.objects.get(user=self.user)
+        self.assertEqual(profile.failed_login_attempts, 1)
+
+    def test_successful_login_resets_counter(self):
+        self._fail_login()
+
+        self.client.post(self.url, {"username": "tenant", "password": "correct-pass"})
+
+        profile = UserSecurityProfile.objects.get(user=self.user)
+        self.assertEqual(profile.failed_login_attempts, 0)
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
-from core.authz import CapabilityResolver
+from core.authz import Capability, CapabilityResolver, log_role_actions, resolver_for
 from core.models import (
     BudgetFeatureFlag,
     Building,
     BuildingMembership,
     MembershipRole,
+    RoleAuditLog,
     WorkOrder,
 )
 
@@ -222,3 +225,47 @@ class OfficeBootstrapTests(TestCase):
         self.assertTrue(
             Building.objects.filter(pk=office_id, is_system_default=True).exists()
         )
+
+
+class SharedResolverVisibilityTests(TestCase):
+    def test_visible_to_reuses_request_resolver(self):
+        User = get_user_model()
+        owner = User.objects.create_user(username="shared-owner", password="pass")
+        technician = User.objects.create_user(username="shared-tech", password="pass")
+        building = Building.objects.create(owner=owner, name="Shared Tower")
+        BuildingMembership.objects.create(user=technician, building=building, role=MembershipRole.TECHNICIAN)
+        technician = User.objects.get(pk=technician.pk)
+
+        self.assertFalse(resolver_for(technician).has(Capability.VIEW_ALL_BUILDINGS))
+        with CaptureQueriesContext(connection) as ctx:
+            visible = list(Building.objects.visible_to(technician).values_list("pk", flat=True))
+
+        self.assertEqual(visible, [building.pk])
+        membership_table = BuildingMembership._meta.db_table
+        self.assertFalse([query for query in ctx.captured_queries if membership_table in query["sql"]])
+
+
+class RoleAuditLogBatchTests(TestCase):
+    def test_log_role_actions_inserts_all_entries(self):
+        User = get_user_model()
+        actor = User.objects.create_user(username="auditor", password="pass")
+        building = Building.objects.create(owner=actor, name="Audited")
+        targets = [User.objects.create_user(username=f"member-{i}", password="pass") for i in range(3)]
+
+        logs = log_role_actions(
+            [
+                {
+                    "actor": actor,
+                    "target_user": target,
+                    "building": building,
+                    "role": MembershipRole.TECHNICIAN,
+                    "action": RoleAuditLog.Action.ROLE_ADDED,
+                }
+                for target in targets
+            ]
+        )
+
+        self.assertEqual(len(logs), 3)
+        self.assertEqual(RoleAuditLog.objects.filter(building=building, target_user__in=targets).count(), 3)
+        self.assertTrue(all(log.payload == {} for log in logs))
+        self.assertEqual(log_role_actions([]), [])
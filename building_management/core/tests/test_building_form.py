@@ -5,8 +5,8 @@ from django.contrib.auth import get_user_model
 from django.test import Client, TestCase
 from django.urls import reverse
 
-from core.forms import BuildingForm
-from core.models import Building, BuildingMembership, MembershipRole
+from core.forms import BuildingForm, BuildingMembershipForm, UnitForm
+from core.models import Building, BuildingMembership, MembershipRole, Unit
 
 
 class BuildingFormTests(TestCase):
@@ -55,6 +55,34 @@ class BuildingFormTests(TestCase):
         building = form.save()
         self.assertEqual(building.role, Building.Role.PROPERTY_MANAGER)
 
+    def test_owner_choices_render_from_one_query(self):
+        BuildingForm(user=self.admin)
+        with self.assertNumQueries(1):
+            rendered = str(BuildingForm(user=self.admin)["owner"])
+        self.assertIn("building-tech", rendered)
+
+    def test_promoted_technician_owner_keeps_posted_role(self):
+        promoted = get_user_model().objects.create_user(username="late-tech", password="pass1234")
+        BuildingMembership.objects.create(user=promoted, building=None, role=MembershipRole.LAWYER)
+        BuildingForm(user=self.admin)
+        # update() skips model signals, like the admin role flow does
+        BuildingMembership.objects.filter(user=promoted).update(role=MembershipRole.TECHNICIAN)
+
+        form = BuildingForm(
+            data={
+                "owner": str(promoted.pk),
+                "role": Building.Role.PROPERTY_MANAGER,
+                "name": "Promoted Building",
+                "address": "Side Street",
+                "description": "",
+            },
+            user=self.admin,
+        )
+
+        self.assertFalse(form.fields["role"].disabled)
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.save().role, Building.Role.PROPERTY_MANAGER)
+
     def test_create_page_renders_role_after_owner_before_name_and_address(self):
         self.client.force_login(self.admin)
         response = self.client.get(reverse("core:building_create"))
@@ -76,3 +104,100 @@ class BuildingFormTests(TestCase):
         self.assertLess(role_idx, name_idx)
         self.assertLess(name_idx, address_idx)
         self.assertLess(address_idx, description_idx)
+
+
+class UnitFormUniquenessTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.owner = User.objects.create_user(username="unit-owner", password="pass1234", is_superuser=True)
+        self.building = Building.objects.create(owner=self.owner, name="Unit Tower")
+        self.existing = Unit.objects.create(building=self.building, number="A1")
+
+    def test_duplicate_number_is_rejected_case_insensitively(self):
+        form = UnitForm(data={"number": " a1 "}, user=self.owner, building=self.building)
+
+        self.assertFalse(form.is_valid())
+        self.assertIn("number", form.errors)
+
+    def test_editing_unit_keeps_its_own_number(self):
+        form = UnitForm(data={"number": "A1"}, instance=self.existing, user=self.owner, building=self.building)
+
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_building_pk_matching_instance_reuses_cached_building(self):
+        unit = Unit.objects.select_related("building").get(pk=self.existing.pk)
+        form = UnitForm(data={"number": "A1"}, instance=unit, user=self.owner, building=self.building.pk)
+        form.cleaned_data = {}
+
+        with self.assertNumQueries(0):
+            self.assertIs(form._resolve_building(), unit.building)
+
+
+class BuildingMembershipFormTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.owner = User.objects.create_user(username="membership-owner", password="pass1234")
+        self.building = Building.objects.create(owner=self.owner, name="Membership Tower")
+        self.lawyer = User.objects.create_user(
+            username="counsel", password="pass1234", first_name="Ada", last_name="Law"
+        )
+        BuildingMembership.objects.create(user=self.lawyer, building=None, role=MembershipRole.LAWYER)
+
+    def test_existing_building_role_is_reported_by_name(self):
+        BuildingMembership.objects.create(user=self.lawyer, building=self.building, role=MembershipRole.LAWYER)
+        form = BuildingMembershipForm(
+            data={"role": MembershipRole.LAWYER, "user": [self.lawyer.pk]},
+            building=self.building,
+        )
+
+        self.assertFalse(form.is_valid())
+        self.assertIn("Ada Law", str(form.errors["user"]))
+
+    def test_new_role_is_accepted(self):
+        form = BuildingMembershipForm(
+            data={"role": MembershipRole.LAWYER, "user": [self.lawyer.pk]},
+            building=self.building,
+        )
+
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_save_inserts_all_selected_members(self):
+        User = get_user_model()
+        second = User.objects.create_user(username="counsel-2", password="pass1234")
+        BuildingMembership.objects.create(user=second, building=None, role=MembershipRole.LAWYER)
+        form = BuildingMembershipForm(
+            data={"role": MembershipRole.LAWYER, "user": [self.lawyer.pk, second.pk]},
+            building=self.building,
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+
+        memberships = form.save()
+
+        self.assertTrue(all(membership.pk for membership in memberships))
+        self.assertEqual(
+            set(
+                BuildingMembership.objects.filter(
+                    building=self.building, role=MembershipRole.LAWYER
+                ).values_list("user_id", flat=True)
+            ),
+            {self.lawyer.pk, second.pk},
+        )
+
+    def test_technician_subrole_is_read_from_prefixed_field(self):
+        User = get_user_model()
+        technician = User.objects.create_user(username="tech-sub", password="pass1234")
+        BuildingMembership.objects.create(user=technician, building=None, role=MembershipRole.TECHNICIAN)
+        subrole = Building.Role.choices[0][0]
+        form = BuildingMembershipForm(
+            data={
+                "m-role": MembershipRole.TECHNICIAN,
+                "m-user": [technician.pk],
+                f"m-subrole_user_{technician.pk}": f" {subrole} ",
+            },
+            building=self.building,
+            prefix="m",
+        )
+
+        self.assertEqual(form.subrole_field_name(technician.pk), f"m-subrole_user_{technician.pk}")
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data["technician_subroles_map"], {technician.pk: subrole})
@@ -78,3 +78,14 @@ class BuildingMembershipCapabilityOverrideTests(TestCase):
         self.assertIn(Capability.CREATE_UNITS, membership.resolved_capabilities)
         resolver = CapabilityResolver(self.user)
         self.assertTrue(resolver.has(Capability.CREATE_UNITS, building_id=self.building.pk))
+
+    def test_has_any_checks_global_and_building_capabilities(self):
+        other = get_user_model().objects.create_user(username="scoped-tech", password="pass1234")
+        BuildingMembership.objects.create(user=other, building=self.building, role=MembershipRole.TECHNICIAN)
+        resolver = CapabilityResolver(other)
+
+        self.assertTrue(
+            resolver.has_any(Capability.VIEW_USERS, Capability.CREATE_UNITS, building_id=self.building.pk)
+        )
+        self.assertFalse(resolver.has_any(Capability.VIEW_USERS, Capability.CREATE_UNITS))
+        self.assertFalse(resolver.has_any(Capability.VIEW_USERS, building_id=self.building.pk))
@@ -8,7 +8,7 @@ from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import override
 
-from core.forms import WorkOrderForm
+from core.forms import WorkOrderForm, _workorder_has_approvers
 from core.models import Building, BuildingMembership, MembershipRole, Unit, WorkOrder, WorkOrderAuditLog
 from core.views.work_orders import _maybe_handle_forwarding_change
 
@@ -373,3 +373,32 @@ class LawyerWorkOrdersPageTests(TestCase):
         response = self.client.get(reverse("core:lawyer_work_orders"))
         self.assertEqual(response.status_code, 200)
         self.assertNotContains(response, "Add new lawyer order")
+
+
+class WorkOrderApproverAvailabilityTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.User = User
+        self.owner = User.objects.create_user(username="approver-owner", password="pass")
+        self.building = Building.objects.create(owner=self.owner, name="Gamma")
+
+    def test_technician_owner_alone_is_not_an_approver(self):
+        self.assertFalse(_workorder_has_approvers(self.building))
+        self.assertFalse(_workorder_has_approvers(None))
+
+    def test_active_backoffice_member_is_an_approver(self):
+        backoffice = self.User.objects.create_user(username="approver-bo", password="pass")
+        BuildingMembership.objects.create(user=backoffice, building=self.building, role=MembershipRole.BACKOFFICE)
+
+        self.assertTrue(_workorder_has_approvers(self.building))
+
+        backoffice.is_active = False
+        backoffice.save(update_fields=["is_active"])
+        self.assertFalse(_workorder_has_approvers(self.building))
+
+    def test_global_administrator_is_an_approver(self):
+        admin = self.User.objects.create_user(username="approver-admin", password="pass")
+        BuildingMembership.objects.create(user=admin, building=None, role=MembershipRole.ADMINISTRATOR)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(_workorder_has_approvers(self.building))
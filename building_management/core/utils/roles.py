@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef
+
+from core.authz import resolver_for
 from core.models import BuildingMembership, MembershipRole
 
 
@@ -9,13 +13,22 @@ def _cached_memberships(user):
     cached = getattr(user, "_membership_rows_cache", None)
     if cached is not None:
         return cached
-    rows = list(
-        BuildingMembership.objects.filter(user=user).values_list("building_id", "role")
-    )
+    rows = list(resolver_for(user).membership_rows)
     setattr(user, "_membership_rows_cache", rows)
     return rows
 
 
+def user_roles(user) -> frozenset[str]:
+    """Return every role the user holds, in any building or globally."""
+    if not user or not getattr(user, "is_authenticated", False):
+        return frozenset()
+    cached = getattr(user, "_membership_roles_cache", None)
+    if cached is None:
+        cached = frozenset(role for _, role in _cached_memberships(user))
+        setattr(user, "_membership_roles_cache", cached)
+    return cached
+
+
 def user_can_approve_work_orders(user, building_id: int | None) -> bool:
     if not user or not getattr(user, "is_authenticated", False):
         return False
@@ -34,13 +47,12 @@ def user_can_approve_work_orders(user, building_id: int | None) -> bool:
 def user_has_role(user, role: str, building_id: int | None = None) -> bool:
     if not user or not getattr(user, "is_authenticated", False):
         return False
+    if not building_id:
+        return role in user_roles(user)
     for membership_building_id, membership_role in _cached_memberships(user):
         if membership_role != role:
             continue
-        if building_id:
-            if membership_building_id is None or membership_building_id == building_id:
-                return True
-        else:
+        if membership_building_id is None or membership_building_id == building_id:
             return True
     return False
 
@@ -62,3 +74,23 @@ def user_is_admin_or_backoffice(user, building_id: int | None = None) -> bool:
         MembershipRole.BACKOFFICE,
         building_id=building_id,
     )
+
+
+def technician_owner_queryset():
+    """Users holding a global technician membership, i.e. valid building owners."""
+    # A semi-join keeps one row per user without DISTINCT.
+    return get_user_model().objects.filter(
+        Exists(
+            BuildingMembership.objects.filter(
+                user=OuterRef("pk"),
+                building__isnull=True,
+                role=MembershipRole.TECHNICIAN,
+            )
+        )
+    ).order_by("username")
+
+
+def technician_owner_choices() -> list[tuple[int, str]]:
+    """``(pk, label)`` pairs for owner pickers, read live so newly promoted technicians show up."""
+    users = technician_owner_queryset().only("id", "username", "first_name", "last_name")
+    return [(user.pk, user.get_full_name() or user.get_username()) for user in users]
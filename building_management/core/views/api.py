@@ -20,7 +20,7 @@ from django.utils.dateparse import parse_date
 from django.utils.translation import gettext as _
 from django.views.decorators.http import require_http_methods
 
-from ..authz import Capability
+from ..authz import Capability, resolver_for
 from ..forms import BudgetExpenseForm, BudgetRequestApprovalForm, BudgetRequestForm
 from ..models import (
     BudgetRequest,
@@ -36,7 +36,12 @@ from ..models import (
     WorkOrderAttachment,
     start_of_week,
 )
-from ..services import NotificationPayload, NotificationService, validate_work_order_attachment
+from ..services import (
+    NotificationPayload,
+    NotificationService,
+    attachment_validation_config,
+    validate_work_order_attachment,
+)
 from .common import _user_has_building_capability, format_attachment_delete_confirm
 from .work_orders import _log_attachment_activity
 
@@ -259,7 +264,7 @@ def _user_can_log_budget_expense(user, budget: BudgetRequest) -> bool:
         return False
     if budget.requester_id == getattr(user, "pk", None):
         return True
-    resolver = CapabilityResolver(user)
+    resolver = resolver_for(user)
     return resolver.has(Capability.MANAGE_BUDGETS, building_id=budget.building_id)
 
 
@@ -1066,7 +1071,7 @@ def api_budget_request_detail(request, pk: int):
     budget = _get_budget_or_404(request, pk)
     if request.method == "GET":
         return JsonResponse(_budget_payload(budget), status=200)
-    resolver = CapabilityResolver(request.user)
+    resolver = resolver_for(request.user)
     if not resolver.has(Capability.APPROVE_BUDGETS, building_id=budget.building_id):
         return JsonResponse({"error": _("You cannot approve this budget.")}, status=403)
     try:
@@ -1203,9 +1208,10 @@ def api_workorder_attachments(request, pk: int):
 
     errors: list[dict[str, object]] = []
     valid_files = []
+    config = attachment_validation_config()
     for uploaded in files:
         try:
-            validate_work_order_attachment(uploaded)
+            validate_work_order_attachment(uploaded, config=config)
         except ValidationError as exc:
             errors.append(
                 {
@@ -11,7 +11,7 @@ from django.utils import timezone
 from django.utils.translation import gettext as _
 from django.views.generic import TemplateView
 
-from ..authz import Capability, CapabilityResolver
+from ..authz import Capability, resolver_for
 from ..models import RoleAuditLog, WorkOrderAuditLog
 
 
@@ -19,7 +19,7 @@ class AuditTrailView(LoginRequiredMixin, TemplateView):
     template_name = "core/audit_trail.html"
 
     def dispatch(self, request, *args, **kwargs):
-        resolver = CapabilityResolver(request.user)
+        resolver = resolver_for(request.user)
         if not resolver.has(Capability.VIEW_AUDIT_LOG):
             messages.error(request, _("You do not have access to the audit log."))
             return HttpResponseForbidden()
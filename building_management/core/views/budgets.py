@@ -18,7 +18,7 @@ from django.utils.dateparse import parse_date
 from django.views.generic import DetailView, FormView, ListView, TemplateView, CreateView, UpdateView, View
 from django.core.paginator import Paginator
 
-from ..authz import Capability, CapabilityResolver
+from ..authz import Capability, resolver_for
 from ..forms import (
     ArchivePurgeForm,
     BudgetExpenseForm,
@@ -116,7 +116,7 @@ def _user_can_delete_budget(budget: BudgetRequest, user) -> bool:
     if is_mass_assigned:
         return _user_is_budget_admin(user)
     if budget.status == BudgetRequest.Status.APPROVED:
-        resolver = CapabilityResolver(user)
+        resolver = resolver_for(user)
         return resolver.has(Capability.APPROVE_BUDGETS, building_id=budget.building_id)
     return (
         budget.requester_id == getattr(user, "pk", None)
@@ -138,7 +138,7 @@ def _user_can_archive_budget(budget: BudgetRequest, user) -> bool:
         return False
     if budget.requester_id == getattr(user, "pk", None):
         return True
-    resolver = CapabilityResolver(user)
+    resolver = resolver_for(user)
     return resolver.has(Capability.APPROVE_BUDGETS, building_id=budget.building_id)
 
 def _user_can_log_budget_expense(budget: BudgetRequest, user) -> bool:
@@ -148,7 +148,7 @@ def _user_can_log_budget_expense(budget: BudgetRequest, user) -> bool:
         return False
     if budget.requester_id == getattr(user, "pk", None):
         return True
-    resolver = CapabilityResolver(user)
+    resolver = resolver_for(user)
     return resolver.has(Capability.MANAGE_BUDGETS, building_id=budget.building_id)
 
 def _coerce_int(value):
@@ -227,7 +227,7 @@ class BudgetListView(LoginRequiredMixin, BudgetFeatureRequiredMixin, TemplateVie
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         user = self.request.user
-        resolver = CapabilityResolver(user)
+        resolver = resolver_for(user)
         base_budget_qs = (
             BudgetRequest.objects.visible_to(self.request.user)
             .active()
@@ -874,7 +874,7 @@ class BudgetDetailView(LoginRequiredMixin, BudgetFeatureRequiredMixin, DetailVie
             ctx["expense_attachment_i18n"] = _expense_attachment_i18n()
             ctx["expense_attachment_panel_title"] = _("Attachments")
         ctx["events"] = budget.events.select_related("actor")
-        resolver = CapabilityResolver(self.request.user)
+        resolver = resolver_for(self.request.user)
         ctx["can_review_budget"] = (
             budget.status == BudgetRequest.Status.PENDING_REVIEW
             and resolver.has(
@@ -1029,7 +1029,7 @@ class BudgetReviewQueueView(LoginRequiredMixin, BudgetFeatureRequiredMixin, List
     context_object_name = "pending_budgets"
 
     def get_queryset(self):
-        resolver = CapabilityResolver(self.request.user)
+        resolver = resolver_for(self.request.user)
         if not resolver.has(Capability.APPROVE_BUDGETS):
             raise Http404()
         qs = (
@@ -1170,7 +1170,7 @@ class BudgetArchivedListView(LoginRequiredMixin, BudgetFeatureRequiredMixin, Tem
     ]
 
     def dispatch(self, request, *args, **kwargs):
-        resolver = CapabilityResolver(request.user)
+        resolver = resolver_for(request.user)
         if not resolver.has(Capability.APPROVE_BUDGETS):
             raise Http404()
         return super().dispatch(request, *args, **kwargs)
@@ -1357,7 +1357,7 @@ class BudgetArchivePurgeView(LoginRequiredMixin, BudgetFeatureRequiredMixin, Vie
     form_class = ArchivePurgeForm
 
     def dispatch(self, request, *args, **kwargs):
-        resolver = CapabilityResolver(request.user)
+        resolver = resolver_for(request.user)
         if not resolver.has(Capability.APPROVE_BUDGETS) or not user_is_admin_or_backoffice(request.user):
             raise Http404()
         return super().dispatch(request, *args, **kwargs)
@@ -1405,7 +1405,7 @@ class BudgetArchivePurgeView(LoginRequiredMixin, BudgetFeatureRequiredMixin, Vie
 
 class BudgetArchivePurgePreviewView(LoginRequiredMixin, BudgetFeatureRequiredMixin, View):
     def dispatch(self, request, *args, **kwargs):
-        resolver = CapabilityResolver(request.user)
+        resolver = resolver_for(request.user)
         if not resolver.has(Capability.APPROVE_BUDGETS) or not user_is_admin_or_backoffice(request.user):
             raise Http404()
         return super().dispatch(request, *args, **kwargs)
@@ -1433,7 +1433,7 @@ class BudgetArchivedRequesterDeleteView(LoginRequiredMixin, BudgetFeatureRequire
     """
 
     def dispatch(self, request, *args, **kwargs):
-        resolver = CapabilityResolver(request.user)
+        resolver = resolver_for(request.user)
         if not resolver.has(Capability.APPROVE_BUDGETS) or not user_is_admin_or_backoffice(request.user):
             raise Http404()
         return super().dispatch(request, *args, **kwargs)
@@ -1481,7 +1481,7 @@ class BudgetArchivedItemDeleteView(LoginRequiredMixin, BudgetFeatureRequiredMixi
     """
 
     def dispatch(self, request, *args, **kwargs):
-        resolver = CapabilityResolver(request.user)
+        resolver = resolver_for(request.user)
         if not resolver.has(Capability.APPROVE_BUDGETS) or not user_is_admin_or_backoffice(request.user):
             raise Http404()
         return super().dispatch(request, *args, **kwargs)
@@ -1503,7 +1503,7 @@ class BudgetArchivedBulkDeleteView(LoginRequiredMixin, BudgetFeatureRequiredMixi
     """
 
     def dispatch(self, request, *args, **kwargs):
-        resolver = CapabilityResolver(request.user)
+        resolver = resolver_for(request.user)
         if not resolver.has(Capability.APPROVE_BUDGETS) or not user_is_admin_or_backoffice(request.user):
             raise Http404()
         return super().dispatch(request, *args, **kwargs)
@@ -1607,7 +1607,7 @@ class BudgetTechnicianSummaryView(LoginRequiredMixin, BudgetFeatureRequiredMixin
 
 class BudgetExportView(LoginRequiredMixin, BudgetFeatureRequiredMixin, View):
     def get(self, request, *args, **kwargs) -> HttpResponse:
-        resolver = CapabilityResolver(request.user)
+        resolver = resolver_for(request.user)
         if not resolver.has(Capability.EXPORT_BUDGETS):
             raise Http404()
         qs = (
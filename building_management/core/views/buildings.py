@@ -18,7 +18,7 @@ from django.utils import timezone
 from django.utils.translation import gettext as _
 from django.views.generic import CreateView, DeleteView, DetailView, ListView, TemplateView, UpdateView
 
-from ..authz import Capability, CapabilityResolver, log_role_action
+from ..authz import Capability, log_role_action, log_role_actions, resolver_for
 from ..forms import BuildingForm, BuildingMembershipForm, TechnicianSubroleForm, UnitForm
 from ..models import (
     Building,
@@ -80,7 +80,7 @@ class BuildingListView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         user = self.request.user
-        resolver = CapabilityResolver(user) if user.is_authenticated else None
+        resolver = resolver_for(user) if user.is_authenticated else None
         today = timezone.localdate()
 
         self._ensure_office_building_for_user(user)
@@ -448,7 +448,7 @@ class BuildingDetailView(LoginRequiredMixin, UserPassesTestMixin, CachedObjectMi
         show_units_tab = not bld.is_system_default
         ctx["show_units_tab"] = show_units_tab
 
-        resolver = CapabilityResolver(request.user) if request.user.is_authenticated else None
+        resolver = resolver_for(request.user) if request.user.is_authenticated else None
         is_technician_user = user_has_role(request.user, MembershipRole.TECHNICIAN)
         can_manage_building = resolver.has(Capability.MANAGE_BUILDINGS, building_id=bld.pk) if resolver else False
         can_manage_units = can_manage_building or (resolver.has(Capability.CREATE_UNITS, building_id=bld.pk) if resolver else False)
@@ -1049,7 +1049,7 @@ class BuildingMembershipManageView(CapabilityRequiredMixin, LoginRequiredMixin,
             Building.objects.visible_to(request.user),
             pk=kwargs["pk"],
         )
-        resolver = CapabilityResolver(request.user) if request.user.is_authenticated else None
+        resolver = resolver_for(request.user) if request.user.is_authenticated else None
         self._can_manage_memberships = (
             resolver.has(Capability.MANAGE_MEMBERSHIPS, building_id=self.building.pk)
             if resolver
@@ -1088,15 +1088,19 @@ class BuildingMembershipManageView(CapabilityRequiredMixin, LoginRequiredMixin,
         form = BuildingMembershipForm(request.POST, building=self.building)
         if form.is_valid():
             memberships = form.save()
-            for membership in memberships:
-                log_role_action(
-                    actor=request.user,
-                    target_user=membership.user,
-                    building=self.building,
-                    role=membership.role,
-                    action=RoleAuditLog.Action.ROLE_ADDED,
-                    payload={"reason": "manual_add"},
-                )
+            log_role_actions(
+                [
+                    {
+                        "actor": request.user,
+                        "target_user": membership.user,
+                        "building": self.building,
+                        "role": membership.role,
+                        "action": RoleAuditLog.Action.ROLE_ADDED,
+                        "payload": {"reason": "manual_add"},
+                    }
+                    for membership in memberships
+                ]
+            )
             if memberships:
                 messages.success(
                     request,
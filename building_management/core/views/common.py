@@ -12,7 +12,7 @@ from django.utils.html import format_html
 from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.translation import gettext as _
 
-from ..authz import Capability, CapabilityResolver
+from ..authz import Capability, resolver_for
 
 __all__ = [
     "AdminRequiredMixin",
@@ -34,7 +34,7 @@ def _user_can_access_building(user, building) -> bool:
         return False
     if user.is_superuser:
         return True
-    resolver = CapabilityResolver(user)
+    resolver = resolver_for(user)
     building_id = getattr(building, "pk", None)
     if building_id is None:
         return False
@@ -243,10 +243,7 @@ def _user_has_capability(user, capability: str) -> bool:
         return False
     if user.is_superuser:
         return True
-    resolver = getattr(user, "_capability_resolver_cache", None)
-    if resolver is None:
-        resolver = CapabilityResolver(user)
-        setattr(user, "_capability_resolver_cache", resolver)
+    resolver = resolver_for(user)
     return resolver.has(capability)
 
 
@@ -260,10 +257,7 @@ def _user_has_building_capability(user, building, *capabilities: str) -> bool:
     building_id = getattr(building, "pk", None)
     if building_id is None:
         return False
-    resolver = getattr(user, "_capability_resolver_cache", None)
-    if resolver is None:
-        resolver = CapabilityResolver(user)
-        setattr(user, "_capability_resolver_cache", resolver)
+    resolver = resolver_for(user)
     cache = getattr(user, "_building_capability_cache", None)
     if cache is None:
         cache = {}
@@ -305,12 +299,12 @@ class CapabilityRequiredMixin(UserPassesTestMixin):
             return False
         if user.is_superuser:
             return True
-        resolver = CapabilityResolver(user)
+        resolver = resolver_for(user)
         building_id = self.get_capability_building_id()
         capabilities = self.get_required_capabilities()
         if not capabilities:
             return True
-        return any(resolver.has(cap, building_id=building_id) for cap in capabilities)
+        return resolver.has_any(*capabilities, building_id=building_id)
 
     def handle_no_permission(self):
         user = getattr(self.request, "user", None)
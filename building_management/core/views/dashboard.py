@@ -12,7 +12,7 @@ from django.utils import formats, timezone, translation
 from django.utils.translation import gettext as _, ngettext
 from django.views.generic import TemplateView
 
-from ..authz import Capability, CapabilityResolver
+from ..authz import Capability, CapabilityResolver, resolver_for
 from ..models import (
     Building,
     BudgetFeatureFlag,
@@ -42,7 +42,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         user = self.request.user
-        resolver = CapabilityResolver(user)
+        resolver = resolver_for(user)
         self._is_lawyer = user_is_lawyer(user)
         staff_role = self._has_global_staff_role(user)
         self._lawyer_scope_only = self._is_lawyer and not staff_role
@@ -468,7 +468,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             chips.append({"label": _("Scope: All visible buildings"), "remove_url": self.request.path})
         else:
             chips.append({"label": _("Scope: Assigned buildings"), "remove_url": self.request.path})
-        dashboard_label = self._label_for(CapabilityResolver(user))
+        dashboard_label = self._label_for(resolver_for(user))
         if dashboard_label:
             chips.append({"label": dashboard_label, "remove_url": self.request.path})
         return chips
@@ -632,7 +632,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         if not user.is_authenticated:
             return []
 
-        resolver = CapabilityResolver(user)
+        resolver = resolver_for(user)
         visible_buildings = resolver.visible_building_ids()
         if visible_buildings == set():
             return []
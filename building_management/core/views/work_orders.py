@@ -27,7 +27,7 @@ from django.template.loader import render_to_string
 from django.views import View
 from django.views.generic import CreateView, DeleteView, DetailView, FormView, ListView, UpdateView
 
-from ..authz import Capability, CapabilityResolver, log_workorder_action
+from ..authz import Capability, log_workorder_action, resolver_for
 from ..forms import ArchivePurgeForm, MassAssignWorkOrdersForm, WorkOrderBudgetChargeForm, WorkOrderForm
 from ..models import (
     BudgetFeatureFlag,
@@ -178,7 +178,7 @@ class LawyerWorkOrderListView(LoginRequiredMixin, LawyerOrAdminRequiredMixin, Li
     def get_queryset(self):
         request = self.request
         user = request.user
-        resolver = CapabilityResolver(user)
+        resolver = resolver_for(user)
         self._can_view_all = resolver.has(Capability.VIEW_ALL_BUILDINGS)
 
         # pagination size
@@ -766,7 +766,7 @@ class WorkOrderListView(LoginRequiredMixin, ListView):
         with log_duration(logger, "work_orders.list_queryset", extra=extra):
             request = self.request
             user = request.user
-            resolver = CapabilityResolver(user) if user.is_authenticated else None
+            resolver = resolver_for(user) if user.is_authenticated else None
             self._can_view_all = resolver.has(Capability.VIEW_ALL_BUILDINGS) if resolver else False
             self._can_filter_owner = self._can_view_all or _user_can_filter_owner(user)
 
@@ -1926,7 +1926,7 @@ class MassAssignWorkOrdersView(CapabilityRequiredMixin, LoginRequiredMixin, Form
             .select_related("owner")
             .order_by("name", "id")
         )
-        resolver = CapabilityResolver(self.request.user)
+        resolver = resolver_for(self.request.user)
         visible_ids = resolver.visible_building_ids()
         if visible_ids is not None:
             qs = qs.filter(pk__in=visible_ids or [])
@@ -2301,7 +2301,7 @@ class ArchivedWorkOrderFilterMixin:
         ctx["archive_work_orders_url"] = reverse("core:work_orders_archive")
         ctx["archive_budgets_url"] = ""
         user = self.request.user
-        resolver = CapabilityResolver(user) if user.is_authenticated else None
+        resolver = resolver_for(user) if user.is_authenticated else None
         if (
             resolver
             and resolver.has(Capability.APPROVE_BUDGETS)